@@ -0,0 +1,62 @@
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config, pool
+
+from alembic import context
+from app.core.database import Base
+from app.core.settings import config as app_config
+from app.models import attendee, event, user  # noqa: F401
+
+config = context.config
+# The app's DATABASE_URL wins over the placeholder in alembic.ini.
+config.set_main_option("sqlalchemy.url", app_config.DATABASE_URL.replace("%", "%%"))
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(dialect_name):
+    """Skip the Postgres-only search indexes when comparing other backends."""
+
+    def include(obj, name, type_, reflected, compare_to):
+        if type_ == "index" and obj.dialect_options["postgresql"]["using"]:
+            return dialect_name == "postgresql"
+        return True
+
+    return include
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout instead of running it (--sql)."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object(connection.dialect.name),
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,83 @@
+"""initial schema, as created by the original create_all()
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+event_status = sa.Enum(
+    "scheduled", "ongoing", "completed", "canceled", name="eventstatus"
+)
+
+
+def _base_columns():
+    """Columns every table gets from BaseDBModel."""
+    return [
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("username", sa.String(length=150), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("first_name", sa.String(length=100), nullable=False),
+        sa.Column("last_name", sa.String(length=100), nullable=False),
+        sa.Column("phone_number", sa.String(length=20), nullable=True),
+        sa.Column("password", sa.String(length=255), nullable=False),
+        sa.Column("token_version", sa.Integer(), nullable=False),
+        *_base_columns(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "events",
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("location", sa.String(length=255), nullable=False),
+        sa.Column("max_attendees", sa.Integer(), nullable=False),
+        sa.Column("status", event_status, nullable=True),
+        *_base_columns(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_events_id", "events", ["id"])
+
+    op.create_table(
+        "attendees",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("check_in_status", sa.Boolean(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_attendees_id", "attendees", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("attendees")
+    op.drop_table("events")
+    op.drop_table("users")
+    event_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,127 @@
+"""registered_count, unique registrations and listing/search indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+events = sa.table(
+    "events",
+    sa.column("id", sa.Integer),
+    sa.column("registered_count", sa.Integer),
+)
+attendees = sa.table(
+    "attendees",
+    sa.column("id", sa.Integer),
+    sa.column("event_id", sa.Integer),
+    sa.column("user_id", sa.Integer),
+    sa.column("check_in_status", sa.Boolean),
+)
+
+
+def dedupe_attendees() -> None:
+    """
+    Keep the first row of every (event_id, user_id) pair, checked in if any
+    of its duplicates was, so the unique constraint can be added.
+    """
+    first_rows = (
+        sa.select(sa.func.min(attendees.c.id))
+        .group_by(attendees.c.event_id, attendees.c.user_id)
+        .scalar_subquery()
+    )
+    checked_in_first_rows = (
+        sa.select(sa.func.min(attendees.c.id))
+        .group_by(attendees.c.event_id, attendees.c.user_id)
+        .having(
+            sa.func.max(sa.case((attendees.c.check_in_status == sa.true(), 1), else_=0))
+            == 1
+        )
+        .scalar_subquery()
+    )
+    op.execute(
+        attendees.update()
+        .where(attendees.c.id.in_(checked_in_first_rows))
+        .values(check_in_status=True)
+    )
+    op.execute(attendees.delete().where(attendees.c.id.not_in(first_rows)))
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+
+    # Attendee capacity is enforced through this counter; start it at the
+    # number of (deduplicated) registrations each event already has.
+    dedupe_attendees()
+    op.add_column(
+        "events",
+        sa.Column("registered_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        events.update().values(
+            registered_count=sa.select(sa.func.count(attendees.c.id))
+            .where(attendees.c.event_id == events.c.id)
+            .scalar_subquery()
+        )
+    )
+    with op.batch_alter_table("attendees") as batch:
+        batch.create_unique_constraint(
+            "uq_attendees_event_id_user_id", ["event_id", "user_id"]
+        )
+
+    op.create_index("ix_events_start_time_id", "events", ["start_time", "id"])
+    op.create_index("ix_events_status_start_time", "events", ["status", "start_time"])
+    op.create_index("ix_events_status_end_time", "events", ["status", "end_time"])
+    op.create_index("ix_attendees_event_id_id", "attendees", ["event_id", "id"])
+
+    if postgres:
+        # Search indexes, see app/models/event.py.
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_events_name_trgm",
+            "events",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_events_location_trgm",
+            "events",
+            ["location"],
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_events_description_fts",
+            "events",
+            [sa.text("to_tsvector('english', coalesce(description, ''))")],
+            postgresql_using="gin",
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_events_description_fts", table_name="events")
+        op.drop_index("ix_events_location_trgm", table_name="events")
+        op.drop_index("ix_events_name_trgm", table_name="events")
+
+    op.drop_index("ix_attendees_event_id_id", table_name="attendees")
+    op.drop_index("ix_events_status_end_time", table_name="events")
+    op.drop_index("ix_events_status_start_time", table_name="events")
+    op.drop_index("ix_events_start_time_id", table_name="events")
+    with op.batch_alter_table("attendees") as batch:
+        batch.drop_constraint("uq_attendees_event_id_user_id", type_="unique")
+    with op.batch_alter_table("events") as batch:
+        batch.drop_column("registered_count")
@@ -0,0 +1,131 @@
+import json
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from app.core.settings import config
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+COUNTER_FIELDS = ("processed", "succeeded", "failed")
+
+
+def job_key(job_id: str) -> str:
+    return f"checkin_job:{job_id}"
+
+
+def job_upload_key(job_id: str) -> str:
+    return f"checkin_job:{job_id}:upload"
+
+
+def job_results_key(job_id: str) -> str:
+    return f"checkin_job:{job_id}:results"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class CheckInJobStore:
+    """
+    Redis-backed state of background bulk check-in jobs: a hash with the
+    status and processed/succeeded/failed counters, the uploaded file until a
+    worker claims it, and the per-email results appended chunk by chunk. Every
+    key expires CHECKIN_JOB_TTL_SECONDS after the job's last write.
+    """
+
+    def __init__(self, redis: Redis, ttl: int = config.CHECKIN_JOB_TTL_SECONDS):
+        self.redis = redis
+        self.ttl = ttl
+
+    async def create(
+        self, event_id: int, user_id: int, filename: str, content: bytes
+    ) -> str:
+        job_id = uuid4().hex
+        now = _now()
+        pipeline = self.redis.pipeline()
+        pipeline.hset(
+            job_key(job_id),
+            mapping={
+                "job_id": job_id,
+                "event_id": event_id,
+                "user_id": user_id,
+                "filename": filename,
+                "status": JOB_QUEUED,
+                "error": "",
+                "processed": 0,
+                "succeeded": 0,
+                "failed": 0,
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+        pipeline.expire(job_key(job_id), self.ttl)
+        pipeline.set(job_upload_key(job_id), content, ex=self.ttl)
+        await pipeline.execute()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raw = await self.redis.hgetall(job_key(job_id))
+        if not raw:
+            return None
+        job = {_text(key): _text(value) for key, value in raw.items()}
+        for field in ("event_id", "user_id", *COUNTER_FIELDS):
+            job[field] = int(job[field])
+        job["error"] = job["error"] or None
+        return job
+
+    async def claim_upload(self, job_id: str) -> Optional[bytes]:
+        """
+        Take the uploaded file off the job. Only the first caller gets it, so a
+        redelivered task cannot process the same job twice.
+        """
+        return await self.redis.getdel(job_upload_key(job_id))
+
+    async def set_status(
+        self, job_id: str, status: str, error: Optional[str] = None
+    ) -> None:
+        pipeline = self.redis.pipeline()
+        pipeline.hset(
+            job_key(job_id),
+            mapping={"status": status, "error": error or "", "updated_at": _now()},
+        )
+        self._touch(pipeline, job_id)
+        await pipeline.execute()
+
+    async def record_chunk(self, job_id: str, result: dict) -> None:
+        """Append one chunk's bulk check-in result and advance the counters."""
+        entries = [
+            json.dumps({"status": status, **item})
+            for status in ("success", "failed")
+            for item in result[status]
+        ]
+        if not entries:
+            return
+        pipeline = self.redis.pipeline()
+        pipeline.rpush(job_results_key(job_id), *entries)
+        pipeline.hincrby(job_key(job_id), "processed", len(entries))
+        pipeline.hincrby(job_key(job_id), "succeeded", len(result["success"]))
+        pipeline.hincrby(job_key(job_id), "failed", len(result["failed"]))
+        pipeline.hset(job_key(job_id), "updated_at", _now())
+        self._touch(pipeline, job_id)
+        await pipeline.execute()
+
+    async def get_results(self, job_id: str, offset: int, limit: int) -> List[dict]:
+        raw = await self.redis.lrange(
+            job_results_key(job_id), offset, offset + limit - 1
+        )
+        return [json.loads(entry) for entry in raw]
+
+    def _touch(self, pipeline, job_id: str) -> None:
+        pipeline.expire(job_key(job_id), self.ttl)
+        pipeline.expire(job_results_key(job_id), self.ttl)
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
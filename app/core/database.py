@@ -1,14 +1,26 @@
+from typing import Awaitable, Callable
+
+from fastapi import Depends
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.core.pool import engine_options
+from app.core.replicas import ReplicaSet, RoutingSession, record_commit
 from app.core.settings import config
 
 Base = declarative_base()
 
+# Session.info key holding the callbacks registered with after_commit.
+AFTER_COMMIT_KEY = "after_commit"
+
+# Sync engine, kept for Alembic, Celery workers and startup DDL.
 engine = create_engine(
     config.DATABASE_URL,
     echo=False,
     future=True,
+    **engine_options(config.DATABASE_URL, is_async=False),
 )
 
 SessionLocal = sessionmaker(
@@ -18,8 +30,93 @@ SessionLocal = sessionmaker(
     autoflush=False,
 )
 
+# Async engine used by the API request path.
+async_engine = create_async_engine(
+    config.ASYNC_DATABASE_URL,
+    echo=False,
+    **engine_options(config.ASYNC_DATABASE_URL, is_async=True),
+)
+
+# Optional read replicas for reads marked with on_replica().
+replicas = ReplicaSet(
+    [
+        create_async_engine(url, echo=False, **engine_options(url, is_async=True))
+        for url in config.DATABASE_REPLICA_URLS
+    ],
+    retry_after=config.REPLICA_RETRY_SECONDS,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    replicas=replicas,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+def create_task_sessionmaker():
+    """
+    Async engine and session factory for a Celery task that runs a coroutine
+    under asyncio.run. Pooled connections are tied to the event loop that
+    opened them and every run has its own loop, so the engine does not pool;
+    dispose it when the run ends.
+    """
+    connect_args = engine_options(config.ASYNC_DATABASE_URL, is_async=True).get(
+        "connect_args", {}
+    )
+    task_engine = create_async_engine(
+        config.ASYNC_DATABASE_URL,
+        echo=False,
+        poolclass=NullPool,
+        connect_args=connect_args,
+    )
+    return task_engine, async_sessionmaker(
+        bind=task_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+def get_dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_uow(db: AsyncSession = Depends(get_db)):
+    """
+    Unit of work around one endpoint call: repositories only flush, and the
+    request's transaction commits once when the endpoint returns, or rolls
+    back if it raises. Depend on it with scope="function" so the commit lands
+    before the response is sent.
+    """
+    try:
+        yield db
+    except Exception:
+        db.info.pop(AFTER_COMMIT_KEY, None)
+        await db.rollback()
+        raise
+    await db.commit()
+    await record_commit(db)
+    for callback in db.info.pop(AFTER_COMMIT_KEY, []):
+        await callback()
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run `callback` once the unit of work has committed, e.g. to invalidate a
+    cache only when readers can no longer see the old row.
+    """
+    db.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
 
-def get_db():
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
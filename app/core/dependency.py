@@ -1,16 +1,23 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
+from app.core.replicas import served_by_replica, set_actor
 from app.core.security import decode_access_token
+from app.core.settings import config
+from app.core.user_cache import UserPrincipal, user_cache
 from app.repositories.user_repo import UserRepository, get_user_repo
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+def is_admin(user: UserPrincipal) -> bool:
+    return user.email in config.ADMIN_EMAILS
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     user_repo: UserRepository = Depends(get_user_repo),
-):
+) -> UserPrincipal:
     try:
         payload = decode_access_token(token)
         if not payload:
@@ -28,8 +35,13 @@ async def get_current_user(
                 detail="Invalid token payload",
             )
 
+        await set_actor(user_repo.db, email)
+        principal = await user_cache.get(email, token_version)
+        if principal:
+            return principal
+
         # Retrieve the user by email
-        user = await user_repo.get_user_by_email(email)
+        user = await user_repo.get_user_by_email(email, replica=True)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,7 +54,12 @@ async def get_current_user(
                 detail="Token has been invalidated",
             )
 
-        return user
+        principal = UserPrincipal.from_user(user)
+        # A lagging replica may still show a token_version that was revoked
+        # on the primary; don't let that outlive the lag in the cache.
+        if not served_by_replica(user_repo.db):
+            await user_cache.set(principal)
+        return principal
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,172 @@
+import json
+import logging
+import math
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+from app.core.settings import config
+from app.models.event import derive_status
+from app.utils.cache import CacheStats, TTLCache
+from app.utils.constants import EventStatus
+
+logger = logging.getLogger(__name__)
+
+# (local generation, redis version) observed by a lookup; a fill is only stored
+# if no invalidation happened since, which keeps stale reads out of the cache.
+CacheToken = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class EventSnapshot:
+    """Cached event row; quacks like Event for EventResponse.serialize."""
+
+    id: int
+    name: str
+    description: Optional[str]
+    start_time: datetime
+    end_time: datetime
+    location: str
+    max_attendees: int
+    status: Optional[EventStatus]
+    updated_at: datetime
+
+    @property
+    def current_status(self) -> EventStatus:
+        return derive_status(self.status, self.start_time, self.end_time)
+
+    @classmethod
+    def from_event(cls, event) -> "EventSnapshot":
+        return cls(
+            id=event.id,
+            name=event.name,
+            description=event.description,
+            start_time=event.start_time,
+            end_time=event.end_time,
+            location=event.location,
+            max_attendees=event.max_attendees,
+            status=event.status,
+            updated_at=event.updated_at,
+        )
+
+    def to_json(self) -> str:
+        payload = asdict(self)
+        for field in ("start_time", "end_time", "updated_at"):
+            payload[field] = payload[field].isoformat()
+        payload["status"] = self.status.value if self.status else None
+        return json.dumps(payload)
+
+    @classmethod
+    def from_json(cls, raw) -> "EventSnapshot":
+        payload = json.loads(raw)
+        for field in ("start_time", "end_time", "updated_at"):
+            payload[field] = datetime.fromisoformat(payload[field])
+        payload["status"] = (
+            EventStatus(payload["status"]) if payload["status"] else None
+        )
+        return cls(**payload)
+
+
+def event_version_key(event_id: int) -> str:
+    return f"event_cache:{event_id}:version"
+
+
+def event_payload_key(event_id: int, version: int) -> str:
+    return f"event_cache:{event_id}:v{version}"
+
+
+class EventCache:
+    """
+    Two-tier event cache: a per-worker LRU in front of an optional shared Redis
+    tier. Redis entries live under a versioned key, so invalidating an event is
+    a single INCR and a late fill can only land on a key nobody reads anymore.
+    Local entries expire after `local_ttl`, which bounds how long another
+    worker can serve an event after it was invalidated elsewhere.
+    """
+
+    def __init__(self, backend: str, ttl: int, local_ttl: int, maxsize: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=local_ttl)
+        # Every local invalidation bumps the generation; the generation of each
+        # recently invalidated event is kept in an LRU as large as the local tier.
+        self._generation = 0
+        self._invalidated = TTLCache(maxsize=maxsize, ttl=math.inf)
+        self.local_stats = CacheStats()
+        self.redis_stats = CacheStats()
+
+    async def get(self, event_id: int) -> Tuple[Optional[EventSnapshot], CacheToken]:
+        generation = self._generation
+        snapshot = self.local.get(event_id)
+        self.local_stats.record(snapshot is not None)
+        if snapshot is not None or self.backend != "redis":
+            return snapshot, (generation, 0)
+
+        try:
+            redis = get_redis()
+            redis_version = int(await redis.get(event_version_key(event_id)) or 0)
+            raw = await redis.get(event_payload_key(event_id, redis_version))
+        except RedisError:
+            logger.warning("Event cache read failed", exc_info=True)
+            return None, (generation, -1)
+
+        if raw:
+            snapshot = EventSnapshot.from_json(raw)
+            self.local.set(event_id, snapshot)
+        self.redis_stats.record(snapshot is not None)
+        return snapshot, (generation, redis_version)
+
+    async def set(
+        self, event_id: int, snapshot: EventSnapshot, token: CacheToken
+    ) -> None:
+        generation, redis_version = token
+        if self._invalidated_since(event_id, generation):
+            return
+        self.local.set(event_id, snapshot)
+        if self.backend == "redis" and redis_version >= 0:
+            try:
+                await get_redis().set(
+                    event_payload_key(event_id, redis_version),
+                    snapshot.to_json(),
+                    ex=self.ttl,
+                )
+            except RedisError:
+                logger.warning("Event cache write failed", exc_info=True)
+
+    def _invalidated_since(self, event_id: int, generation: int) -> bool:
+        # After maxsize more invalidations the event's may have been evicted.
+        if self._generation - generation >= self._invalidated.maxsize:
+            return True
+        return self._invalidated.get(event_id, 0) > generation
+
+    async def invalidate(self, event_id: int) -> None:
+        self._generation += 1
+        self._invalidated.set(event_id, self._generation)
+        self.local.pop(event_id)
+        if self.backend == "redis":
+            try:
+                await get_redis().incr(event_version_key(event_id))
+            except RedisError:
+                logger.warning("Event cache invalidation failed", exc_info=True)
+
+    def stats_dict(self) -> dict:
+        hits = self.local_stats.hits + self.redis_stats.hits
+        lookups = self.local_stats.hits + self.local_stats.misses
+        return {
+            "backend": self.backend,
+            "size": len(self.local),
+            "local": self.local_stats.as_dict(),
+            "redis": self.redis_stats.as_dict(),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+event_cache = EventCache(
+    backend=config.EVENT_CACHE_BACKEND,
+    ttl=config.EVENT_CACHE_TTL_SECONDS,
+    local_ttl=config.EVENT_CACHE_LOCAL_TTL_SECONDS,
+    maxsize=config.EVENT_CACHE_MAX_SIZE,
+)
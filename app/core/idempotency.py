@@ -0,0 +1,208 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.routing import APIRoute
+from fastapi.security.utils import get_authorization_scheme_param
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.core.redis import get_redis
+from app.core.security import decode_access_token
+from app.core.settings import config
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENT_ATTR = "__idempotent__"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL_SECONDS = 0.05
+
+KEY_PENDING = "pending"
+KEY_COMPLETED = "completed"
+
+
+def idempotent(endpoint):
+    """
+    Let clients retry the decorated route with an Idempotency-Key header and
+    get the first response back instead of running it again. Only takes
+    effect on routers created with route_class=IdempotentRoute.
+    """
+    setattr(endpoint, IDEMPOTENT_ATTR, True)
+    return endpoint
+
+
+def _storable(response: Response) -> bool:
+    # Server errors and rate limiting are worth retrying; streams can't be kept.
+    return (
+        hasattr(response, "body")
+        and response.status_code < 500
+        and response.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+    )
+
+
+class IdempotencyStore:
+    """
+    One Redis key per (user, Idempotency-Key): a pending marker while the
+    first request runs, expiring after IDEMPOTENCY_LOCK_SECONDS in case its
+    worker dies, then the recorded response for IDEMPOTENCY_TTL_SECONDS.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int = config.IDEMPOTENCY_TTL_SECONDS,
+        lock_ttl: int = config.IDEMPOTENCY_LOCK_SECONDS,
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+
+    async def claim(self, key: str, fingerprint: str) -> Optional[dict]:
+        """
+        None when this call now owns `key`, else the record already there
+        ({} if it vanished in between, so the caller should claim again).
+        """
+        pending = json.dumps({"state": KEY_PENDING, "fingerprint": fingerprint})
+        if await self.redis.set(key, pending, nx=True, ex=self.lock_ttl):
+            return None
+        raw = await self.redis.get(key)
+        return json.loads(raw) if raw else {}
+
+    async def complete(self, key: str, fingerprint: str, response: Response) -> None:
+        record = {
+            "state": KEY_COMPLETED,
+            "fingerprint": fingerprint,
+            "status_code": response.status_code,
+            "headers": list(response.headers.items()),
+            "body": base64.b64encode(response.body).decode(),
+        }
+        await self.redis.set(key, json.dumps(record), ex=self.ttl)
+
+    async def release(self, key: str) -> None:
+        await self.redis.delete(key)
+
+
+def _replay(record: dict) -> Response:
+    response = Response(
+        content=base64.b64decode(record["body"]),
+        status_code=record["status_code"],
+        headers=dict(record["headers"]),
+    )
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+def _owner(request: Request) -> Optional[str]:
+    """Subject of a valid bearer token; keys are only ever shared by its holder."""
+    _, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    payload = decode_access_token(token) if token else None
+    return payload.get("sub") if payload else None
+
+
+class IdempotentRoute(APIRoute):
+    """
+    Route class answering retries of @idempotent endpoints from the store
+    before any dependency runs: no authentication lookup, no repository, no
+    transaction. A duplicate arriving while the first request still runs
+    waits for its response instead of executing twice.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not getattr(self.endpoint, IDEMPOTENT_ATTR, False):
+            return handler
+
+        async def idempotent_handler(request: Request) -> Response:
+            idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+            redis = get_redis()
+            owner = _owner(request) if idempotency_key else None
+            if owner is None or redis is None:
+                return await handler(request)
+            if len(idempotency_key) > MAX_KEY_LENGTH:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{IDEMPOTENCY_HEADER} exceeds {MAX_KEY_LENGTH} characters",
+                )
+
+            store = IdempotencyStore(redis)
+            key = f"idempotency:{owner}:{idempotency_key}"
+            fingerprint = hashlib.sha256(
+                f"{request.method} {request.url.path}?{request.url.query}\n".encode()
+                + await request.body()
+            ).hexdigest()
+
+            try:
+                replay = await self._wait_for_claim(store, key, fingerprint)
+            except RedisError:
+                logger.warning("Idempotency store unavailable", exc_info=True)
+                return await handler(request)
+            if replay is not None:
+                return replay
+
+            try:
+                response = await handler(request)
+            except StarletteHTTPException as exc:
+                # The routes raise their 4xx outcomes; keep those like any other.
+                response = await self._render(request, exc)
+            except BaseException:
+                await self._release(store, key)
+                raise
+            try:
+                if _storable(response):
+                    await store.complete(key, fingerprint, response)
+                else:
+                    await store.release(key)
+            except RedisError:
+                logger.warning("Could not record idempotent response", exc_info=True)
+            return response
+
+        return idempotent_handler
+
+    @staticmethod
+    async def _wait_for_claim(
+        store: IdempotencyStore, key: str, fingerprint: str
+    ) -> Optional[Response]:
+        """None once this request owns `key`, or the response to replay."""
+        deadline = time.monotonic() + config.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            record = await store.claim(key, fingerprint)
+            if record is None:
+                return None
+            if record and record["fingerprint"] != fingerprint:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"{IDEMPOTENCY_HEADER} was already used for another request",
+                )
+            if record.get("state") == KEY_COMPLETED:
+                return _replay(record)
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=409,
+                    detail="A request with this Idempotency-Key is still in progress",
+                    headers={"Retry-After": "1"},
+                )
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    @staticmethod
+    async def _render(request: Request, exc: StarletteHTTPException) -> Response:
+        """The response the app's exception handler would send for `exc`."""
+        handler = request.app.exception_handlers.get(
+            StarletteHTTPException, http_exception_handler
+        )
+        return await handler(request, exc)
+
+    @staticmethod
+    async def _release(store: IdempotencyStore, key: str) -> None:
+        try:
+            await store.release(key)
+        except RedisError:
+            logger.warning("Could not release idempotency key", exc_info=True)
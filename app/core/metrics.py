@@ -0,0 +1,255 @@
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.pool import pool_stats
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.", ["method", "route", "status"]
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements run per HTTP request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL statements per HTTP request.",
+    ["method", "route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements run.", ["engine"])
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency.",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+
+
+# Statements of the HTTP request being handled; None outside of one.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def track_queries(engine: Engine, name: str) -> None:
+    """Count and time every statement `engine` runs, overall and per request."""
+    queries = DB_QUERIES.labels(name)
+    duration = DB_QUERY_DURATION.labels(name)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        context._query_started = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        elapsed = time.perf_counter() - context._query_started
+        queries.inc()
+        duration.observe(elapsed)
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+# Path template per route object; a route's prefix does not change.
+_templates: Dict[int, str] = {}
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that handled `scope`, e.g.
+    /api/events/{event_id}; only known once routing has run.
+    """
+    route = scope.get("route")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None:
+        return UNMATCHED_ROUTE
+    template = _templates.get(id(route))
+    if template is None:
+        # A route in an included router may only know its own path; the prefix
+        # is the part of the request path in front of what the route matched.
+        path = scope["path"]
+        start = 0
+        while start != -1 and not path_regex.match(path[start:]):
+            start = path.find("/", start + 1)
+        template = (path[:start] if start > 0 else "") + route.path
+        _templates[id(route)] = template
+    return template
+
+
+class PrometheusMiddleware:
+    """
+    Pure ASGI middleware recording request count, latency and SQL statements
+    per route template. Label sets are bounded by the routes, since unmatched
+    paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_query_stats.reset(token)
+            requests, duration, db_queries, db_duration = _request_metrics(
+                scope["method"], route_template(scope), status
+            )
+            requests.inc()
+            duration.observe(elapsed)
+            db_queries.observe(stats.count)
+            db_duration.observe(stats.duration)
+
+
+@lru_cache(maxsize=4096)
+def _request_metrics(method: str, route: str, status: str):
+    # Resolving labelled children takes a lock and a dict lookup per metric.
+    return (
+        REQUESTS.labels(method, route, status),
+        REQUEST_DURATION.labels(method, route),
+        REQUEST_DB_QUERIES.labels(method, route),
+        REQUEST_DB_DURATION.labels(method, route),
+    )
+
+
+async def track_in_progress(request: Request):
+    """
+    App-wide dependency keeping http_requests_in_progress; unlike the
+    middleware it runs after routing, so the route template is known.
+    """
+    gauge = REQUESTS_IN_PROGRESS.labels(request.method, route_template(request.scope))
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+class RuntimeCollector:
+    """Pool occupancy and cache hit ratios, read when Prometheus scrapes."""
+
+    def __init__(
+        self, pools: Callable[[], Dict[str, Pool]], caches: Dict[str, Callable]
+    ):
+        self.pools = pools
+        self.caches = caches
+
+    def collect(self):
+        connections = GaugeMetricFamily(
+            "db_pool_connections",
+            "Connections per pool and state.",
+            labels=["pool", "state"],
+        )
+        wait = GaugeMetricFamily(
+            "db_pool_max_wait_seconds",
+            "Longest wait for a pooled connection.",
+            labels=["pool"],
+        )
+        for name, pool in self.pools().items():
+            stats = pool_stats(pool)
+            for state in ("checked_in", "checked_out", "overflow"):
+                if state in stats:
+                    connections.add_metric([name, state], stats[state])
+            if "wait" in stats:
+                wait.add_metric([name], stats["wait"]["max_wait_ms"] / 1000)
+        yield connections
+        yield wait
+
+        hit_ratio = GaugeMetricFamily(
+            "cache_hit_ratio", "Cache hit ratio since start.", labels=["cache"]
+        )
+        size = GaugeMetricFamily(
+            "cache_entries", "Entries in the local cache tier.", labels=["cache"]
+        )
+        for name, stats_dict in self.caches.items():
+            stats = stats_dict()
+            hit_ratio.add_metric([name], stats["hit_ratio"])
+            size.add_metric([name], stats["size"])
+        yield hit_ratio
+        yield size
+
+
+_runtime_collectors = []
+
+
+def register_runtime_collector(
+    pools: Callable[[], Dict[str, Pool]], caches: Dict[str, Callable]
+) -> None:
+    collector = RuntimeCollector(pools, caches)
+    _runtime_collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def metrics_response() -> Response:
+    """
+    With several gunicorn workers PROMETHEUS_MULTIPROC_DIR is set and every
+    worker writes its samples there; a scrape merges them all. Pool and cache
+    gauges still describe the worker that answered the scrape.
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        for collector in _runtime_collectors:
+            registry.register(collector)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
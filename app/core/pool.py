@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.core.settings import config
+
+
+class PoolWaitStats:
+    """How long callers waited for a pooled connection, and how often in vain."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def as_dict(self) -> dict:
+        attempts = self.checkouts + self.timeouts
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                round(self.total_wait / attempts * 1000, 3) if attempts else 0.0
+            ),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class _TimedPoolMixin:
+    wait_stats: Optional[PoolWaitStats] = None
+
+    def connect(self):
+        if self.wait_stats is None:
+            self.wait_stats = PoolWaitStats()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool that records checkout wait times."""
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times."""
+
+
+def engine_options(url: str, is_async: bool) -> dict:
+    """
+    create_engine / create_async_engine keyword arguments for `url` from the
+    DB_POOL_* settings. SQLite keeps SQLAlchemy's default pool, which is what
+    makes in-memory databases work.
+
+    With DB_PGBOUNCER, PgBouncer does the pooling and hands each transaction
+    whichever server connection is free: the engine keeps no pool of its own,
+    and the driver never reuses prepared statements across transactions.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return {}
+    if config.DB_PGBOUNCER:
+        return {
+            "poolclass": NullPool,
+            "connect_args": pgbouncer_connect_args(parsed.get_driver_name()),
+        }
+
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+
+def pgbouncer_connect_args(driver: str) -> dict:
+    if driver == "asyncpg":
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # asyncpg still prepares every statement under a name; numbered
+            # names collide on server connections another client used before.
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    if driver == "psycopg":
+        return {"prepare_threshold": None}
+    return {}
+
+
+def pool_stats(pool: Pool) -> dict:
+    """Live occupancy of a QueuePool plus its wait times, when it tracks them."""
+    stats = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool.overflow() counts down from -size until the pool fills;
+            # report only the connections opened beyond it.
+            overflow=max(0, pool.overflow()),
+            max_overflow=pool._max_overflow,
+        )
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats["wait"] = wait_stats.as_dict()
+    return stats
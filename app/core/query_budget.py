@@ -0,0 +1,140 @@
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.settings import config
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_ATTR = "__query_budget__"
+
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,?)+\)")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|:\w+|%s")
+_SPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A route ran more SQL statements than its @query_budget allows."""
+
+
+def query_budget(max_queries: int):
+    """
+    Declare the most SQL statements one call of the decorated route may run.
+    Only enforced when QUERY_BUDGET_MODE is "warn" or "raise".
+    """
+
+    def decorator(endpoint):
+        setattr(endpoint, QUERY_BUDGET_ATTR, max_queries)
+        return endpoint
+
+    return decorator
+
+
+def statement_shape(statement: str) -> str:
+    """`statement` with whitespace, bind markers and IN lists normalised."""
+    shape = _SPACE.sub(" ", statement).strip()
+    shape = _PARAM.sub("?", shape)
+    return _IN_LIST.sub("(?)", shape)
+
+
+class QueryLog:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def shapes(self) -> List[Tuple[str, int]]:
+        """Distinct statement shapes, most repeated first."""
+        return Counter(map(statement_shape, self.statements)).most_common()
+
+    def suspected_n_plus_one(
+        self, threshold: int = config.QUERY_N_PLUS_ONE_THRESHOLD
+    ) -> List[Tuple[str, int]]:
+        """SELECT shapes repeated at least `threshold` times, i.e. run in a loop."""
+        return [
+            (shape, count)
+            for shape, count in self.shapes()
+            if count >= threshold and shape.upper().startswith("SELECT")
+        ]
+
+    def report(self) -> str:
+        lines = [f"{len(self)} statements, {len(self.shapes())} distinct:"]
+        suspects = dict(self.suspected_n_plus_one())
+        for shape, count in self.shapes():
+            marker = " <- likely N+1" if shape in suspects else ""
+            lines.append(f"  {count} x {shape}{marker}")
+        return "\n".join(lines)
+
+
+# Statements of the request or capture_queries() block being recorded.
+current_query_log: ContextVar[Optional[QueryLog]] = ContextVar(
+    "current_query_log", default=None
+)
+
+
+def record_queries(engine: Engine) -> None:
+    """Append every statement `engine` runs to the current QueryLog, if any."""
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        log = current_query_log.get()
+        if log is not None:
+            log.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+    """Record the statements run inside the block, e.g. to assert on in a test."""
+    log = QueryLog()
+    token = current_query_log.set(log)
+    try:
+        yield log
+    finally:
+        current_query_log.reset(token)
+
+
+class QueryBudgetMiddleware:
+    """
+    Records each request's statements and checks them against the route's
+    @query_budget, logging likely N+1 patterns. In "raise" mode an overrun
+    raises QueryBudgetExceeded once the response is done, which fails the
+    request in a test client; in "warn" mode it is logged.
+    """
+
+    def __init__(self, app, mode: str = config.QUERY_BUDGET_MODE):
+        self.app = app
+        self.mode = mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with capture_queries() as log:
+            await self.app(scope, receive, send)
+
+        route = scope.get("route")
+        endpoint = getattr(route, "endpoint", None)
+        budget = getattr(endpoint, QUERY_BUDGET_ATTR, None)
+        label = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+        if budget is not None and len(log) > budget:
+            message = (
+                f"{label} ran {len(log)} SQL statements, budget is {budget}.\n"
+                f"{log.report()}"
+            )
+            if self.mode == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        elif log.suspected_n_plus_one():
+            logger.warning(
+                "%s looks like it queries in a loop.\n%s", label, log.report()
+            )
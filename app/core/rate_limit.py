@@ -0,0 +1,170 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from app.core.dependency import get_current_user
+from app.core.redis import get_redis
+from app.core.settings import config
+from app.core.user_cache import UserPrincipal
+from app.schemas.user import UserLogin
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Takes one token from the bucket in KEYS[1] holding up to ARGV[1] tokens and
+# refilled at ARGV[2] tokens per second. Returns {allowed, retry_after}; the
+# float is sent back as a string since Redis truncates Lua numbers. The key
+# expires once the bucket would be full again, so idle clients cost nothing.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+
+local allowed, retry_after = 0, (1 - tokens) / rate
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed, retry_after = 1, 0
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(retry_after)}
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    """A token bucket of `capacity` requests, refilled at `rate` per second."""
+
+    capacity: int
+    rate: float
+
+    @classmethod
+    def parse(cls, value: str) -> Optional["Limit"]:
+        """ "10/minute" allows bursts of 10 and 10 a minute on average; "" is off."""
+        if not value.strip():
+            return None
+        count, _, period = value.strip().partition("/")
+        seconds = PERIODS.get(period.strip().rstrip("s"))
+        if not count.strip().isdigit() or int(count) < 1 or seconds is None:
+            raise ValueError(f"Invalid rate limit {value!r}, expected e.g. '10/minute'")
+        return cls(capacity=int(count), rate=int(count) / seconds)
+
+
+class RateLimiter:
+    """
+    Token buckets shared by all workers through a Lua script in Redis, so the
+    read-refill-take runs atomically. If Redis fails, each worker falls back to
+    its own in-process buckets (a limit then applies per worker) and retries
+    Redis after `retry_after` seconds instead of waiting on it every request.
+    """
+
+    def __init__(self, backend: str, retry_after: float, maxsize: int):
+        self.backend = backend
+        self.retry_after = retry_after
+        self.local = TTLCache(maxsize=maxsize, ttl=0)
+        self._script = None
+        self._redis_down_until = 0.0
+
+    async def hit(self, key: str, limit: Limit) -> float:
+        """Take a token; 0 when allowed, else seconds until one is available."""
+        if self.backend == "redis" and time.monotonic() >= self._redis_down_until:
+            redis = get_redis()
+            if redis is not None:
+                try:
+                    return await self._hit_redis(redis, key, limit)
+                except RedisError:
+                    logger.warning(
+                        "Rate limiter using in-process buckets for %ss",
+                        self.retry_after,
+                        exc_info=True,
+                    )
+                    self._redis_down_until = time.monotonic() + self.retry_after
+        return self._hit_local(key, limit)
+
+    async def _hit_redis(self, redis, key: str, limit: Limit) -> float:
+        if self._script is None:
+            self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        allowed, retry_after = await self._script(
+            keys=[key], args=[limit.capacity, limit.rate]
+        )
+        return 0.0 if allowed else float(retry_after)
+
+    def _hit_local(self, key: str, limit: Limit) -> float:
+        now = time.monotonic()
+        tokens, updated = self.local.get(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+        if tokens < 1:
+            return (1 - tokens) / limit.rate
+        self.local.set(key, (tokens - 1, now), ttl=limit.capacity / limit.rate)
+        return 0.0
+
+
+rate_limiter = RateLimiter(
+    backend=config.RATE_LIMIT_BACKEND,
+    retry_after=config.RATE_LIMIT_REDIS_RETRY_SECONDS,
+    maxsize=config.RATE_LIMIT_LOCAL_MAX_KEYS,
+)
+
+
+async def _enforce(name: str, scope: str, identity, limit: Optional[Limit]) -> None:
+    if limit is None or not config.RATE_LIMIT_ENABLED:
+        return
+    retry_after = await rate_limiter.hit(f"rate_limit:{name}:{scope}:{identity}", limit)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+def limit_by_ip(name: str, limit: str):
+    """
+    Route dependency allowing `limit` (e.g. "10/minute") requests per client IP.
+    Put it in the route's `dependencies` so it runs before anything else. Behind
+    a proxy the client IP comes from X-Forwarded-For, which the server only
+    honours from FORWARDED_ALLOW_IPS.
+    """
+    parsed = Limit.parse(limit)
+
+    async def dependency(request: Request):
+        client = request.client.host if request.client else "unknown"
+        await _enforce(name, "ip", client, parsed)
+
+    return dependency
+
+
+def limit_by_user(name: str, limit: str):
+    """Route dependency allowing `limit` requests per authenticated user."""
+    parsed = Limit.parse(limit)
+
+    async def dependency(current_user: UserPrincipal = Depends(get_current_user)):
+        await _enforce(name, "user", current_user.id, parsed)
+
+    return dependency
+
+
+def limit_by_login(name: str, limit: str):
+    """
+    Route dependency allowing `limit` login attempts per username, whichever
+    IP they come from; it shares the endpoint's parsed UserLogin body.
+    """
+    parsed = Limit.parse(limit)
+
+    async def dependency(user_data: UserLogin):
+        await _enforce(name, "account", user_data.username.strip().lower(), parsed)
+
+    return dependency
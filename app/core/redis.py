@@ -0,0 +1,21 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from app.core.settings import config
+
+_client: Optional[Redis] = None
+
+
+def get_redis() -> Optional[Redis]:
+    """Shared asyncio Redis client, or None when REDIS_URL is not configured."""
+    global _client
+    if not config.REDIS_URL:
+        return None
+    if _client is None:
+        _client = Redis.from_url(
+            config.REDIS_URL,
+            socket_timeout=config.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=config.REDIS_SOCKET_TIMEOUT,
+        )
+    return _client
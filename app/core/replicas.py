@@ -0,0 +1,201 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.redis import get_redis
+from app.core.settings import config
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Statement execution option marking a read that a replica may serve.
+USE_REPLICA = "use_replica"
+
+# Session.info keys.
+WROTE_KEY = "wrote"
+ACTOR_KEY = "actor"
+RECENT_WRITER_KEY = "recent_writer"
+REPLICA_KEY = "replica"
+REPLICA_READ_KEY = "replica_read"
+
+READ_YOUR_WRITES_MAX_SIZE = 100000
+
+
+def on_replica(query):
+    """Let a replica serve `query`, when RoutingSession finds one usable."""
+    return query.execution_options(**{USE_REPLICA: True})
+
+
+class ReplicaSet:
+    """
+    Round-robin over replica engines. Replicas are pinged every
+    REPLICA_HEALTH_CHECK_SECONDS, and one whose connection fails in between is
+    skipped for `retry_after` seconds; with none healthy, reads fall back to
+    the primary.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], retry_after: float):
+        self.engines = engines
+        self.retry_after = retry_after
+        self._cycle = itertools.cycle(range(len(engines)))
+        self._down_until: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        for index, engine in enumerate(engines):
+            event.listen(engine.sync_engine, "handle_error", self._error_handler(index))
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Optional[AsyncEngine]:
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                index = next(self._cycle)
+                if self._down_until.get(index, 0) <= now:
+                    return self.engines[index]
+        return None
+
+    def mark_down(self, index: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            was_up = self._down_until.get(index, 0) <= now
+            self._down_until[index] = now + self.retry_after
+        if was_up:
+            logger.warning(
+                "Replica %s marked down for %ss",
+                self.engines[index].url.render_as_string(),
+                self.retry_after,
+            )
+
+    def mark_up(self, index: int) -> None:
+        with self._lock:
+            self._down_until.pop(index, None)
+
+    def _error_handler(self, index: int):
+        def handle_error(context):
+            # Connection failures and drops, not errors in the statement itself.
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(index)
+
+        return handle_error
+
+    async def check(self, timeout: float) -> List[dict]:
+        """Ping every replica and record whether it answered within `timeout`."""
+        results = []
+        for index, engine in enumerate(self.engines):
+            try:
+                await asyncio.wait_for(_ping(engine), timeout)
+            except Exception:
+                self.mark_down(index)
+                healthy = False
+            else:
+                self.mark_up(index)
+                healthy = True
+            results.append({"url": engine.url.render_as_string(), "healthy": healthy})
+        return results
+
+    async def run_health_checks(self, interval: float, timeout: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.check(timeout)
+
+
+async def _ping(engine: AsyncEngine) -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+# Actors (user emails) whose recent commits their reads should still see.
+# Redis shares the window between workers; this per-process copy covers the
+# writer's own worker and stands in for Redis when it is unavailable.
+recent_writers = TTLCache(
+    maxsize=READ_YOUR_WRITES_MAX_SIZE, ttl=config.READ_YOUR_WRITES_SECONDS
+)
+
+
+def recent_writer_key(actor: str) -> str:
+    return f"read_your_writes:{actor}"
+
+
+class RoutingSession(Session):
+    """
+    Sends reads marked with on_replica() to a replica, picked once per session
+    so one request sees one consistent snapshot. Everything else stays on the
+    primary: flushes and DML, every read after the session's first write, and
+    all reads of an actor who committed a write in the last
+    READ_YOUR_WRITES_SECONDS, on whichever worker they wrote.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self._flushing or (clause is not None and clause.is_dml):
+            self.info[WROTE_KEY] = True
+        elif clause is not None and self._replica_allowed(clause):
+            replica = self.info.get(REPLICA_KEY)
+            if replica is None:
+                replica = self.info[REPLICA_KEY] = self.replicas.choose()
+            if replica is not None:
+                self.info[REPLICA_READ_KEY] = True
+                return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def _replica_allowed(self, clause) -> bool:
+        if not self.replicas or self.info.get(WROTE_KEY):
+            return False
+        if not clause.get_execution_options().get(USE_REPLICA):
+            return False
+        return not self.info.get(RECENT_WRITER_KEY)
+
+
+async def set_actor(db: AsyncSession, actor: str) -> None:
+    """
+    Name who the session acts for, and keep its replica reads on the primary
+    if that actor is inside their read-your-writes window.
+    """
+    db.info[ACTOR_KEY] = actor
+    replicas = getattr(db.sync_session, "replicas", None)
+    if replicas and config.READ_YOUR_WRITES_SECONDS:
+        db.info[RECENT_WRITER_KEY] = await is_recent_writer(actor)
+
+
+async def is_recent_writer(actor: str) -> bool:
+    if recent_writers.get(actor) is not None:
+        return True
+    redis = get_redis()
+    if redis is None:
+        return False
+    try:
+        return bool(await redis.exists(recent_writer_key(actor)))
+    except RedisError:
+        logger.warning("Read-your-writes lookup failed", exc_info=True)
+        return False
+
+
+async def record_commit(db: AsyncSession) -> None:
+    """Open the read-your-writes window after a commit that wrote."""
+    actor = db.info.get(ACTOR_KEY)
+    window = config.READ_YOUR_WRITES_SECONDS
+    if not (actor and db.info.pop(WROTE_KEY, False) and window):
+        return
+    recent_writers.set(actor, True, ttl=window)
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.set(recent_writer_key(actor), 1, px=int(window * 1000))
+        except RedisError:
+            logger.warning("Could not record read-your-writes window", exc_info=True)
+
+
+def served_by_replica(db: AsyncSession) -> bool:
+    return bool(db.info.get(REPLICA_READ_KEY))
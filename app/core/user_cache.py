@@ -0,0 +1,123 @@
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+from app.core.settings import config
+from app.utils.cache import CacheStats, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Lightweight authenticated user resolved by get_current_user."""
+
+    id: int
+    email: str
+    username: str
+    token_version: int
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            token_version=user.token_version,
+        )
+
+
+class UserCache:
+    """
+    Caches principals keyed on (email, token_version). With the "memory"
+    backend each worker keeps its own TTL-bounded LRU; with "redis" the
+    entries are shared, so an invalidation is seen by every worker at once.
+    If Redis fails, reads and writes skip it (every lookup goes to the
+    database) for `retry_after` seconds instead of waiting on it per request.
+    """
+
+    def __init__(self, backend: str, ttl: int, maxsize: int, retry_after: float = 10):
+        self.backend = backend
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.stats = CacheStats()
+        self._redis_down_until = 0.0
+
+    @staticmethod
+    def _key(email: str, token_version: int) -> str:
+        return f"user_principal:{email}:{token_version}"
+
+    def _redis(self):
+        if self.backend != "redis" or time.monotonic() < self._redis_down_until:
+            return None
+        return get_redis()
+
+    def _mark_redis_down(self, action: str) -> None:
+        logger.warning(
+            "User cache %s failed, skipping Redis for %ss",
+            action,
+            self.retry_after,
+            exc_info=True,
+        )
+        self._redis_down_until = time.monotonic() + self.retry_after
+
+    async def get(self, email: str, token_version: int) -> Optional[UserPrincipal]:
+        key = self._key(email, token_version)
+        principal = None
+        if self.backend == "redis":
+            redis = self._redis()
+            if redis is not None:
+                try:
+                    raw = await redis.get(key)
+                    principal = UserPrincipal(**json.loads(raw)) if raw else None
+                except RedisError:
+                    self._mark_redis_down("read")
+        else:
+            principal = self.local.get(key)
+        self.stats.record(principal is not None)
+        return principal
+
+    async def set(self, principal: UserPrincipal) -> None:
+        key = self._key(principal.email, principal.token_version)
+        if self.backend == "redis":
+            redis = self._redis()
+            if redis is not None:
+                try:
+                    await redis.set(key, json.dumps(asdict(principal)), ex=self.ttl)
+                except RedisError:
+                    self._mark_redis_down("write")
+        else:
+            self.local.set(key, principal)
+
+    async def invalidate(self, email: str, token_version: int) -> None:
+        key = self._key(email, token_version)
+        self.local.pop(key)
+        # Revocation is rare and must not be lost, so it tries Redis even
+        # while reads and writes are skipping it.
+        redis = get_redis() if self.backend == "redis" else None
+        if redis is not None:
+            try:
+                await redis.delete(key)
+            except RedisError:
+                self._mark_redis_down("invalidation")
+
+    def stats_dict(self) -> dict:
+        return {
+            "backend": self.backend,
+            "size": len(self.local),
+            **self.stats.as_dict(),
+        }
+
+
+user_cache = UserCache(
+    backend=config.USER_CACHE_BACKEND,
+    ttl=config.USER_CACHE_TTL_SECONDS,
+    maxsize=config.USER_CACHE_MAX_SIZE,
+    retry_after=config.USER_CACHE_REDIS_RETRY_SECONDS,
+)
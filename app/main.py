@@ -1,13 +1,70 @@
-import uvicorn
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
 
-from app.core.database import Base, engine
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.core.database import async_engine, engine, replicas
+from app.core.event_cache import event_cache
+from app.core.metrics import (
+    PrometheusMiddleware,
+    metrics_response,
+    register_runtime_collector,
+    track_in_progress,
+    track_queries,
+)
+from app.core.pool import pool_stats
+from app.core.query_budget import QueryBudgetMiddleware, record_queries
+from app.core.settings import config
+from app.core.user_cache import user_cache
 from app.routes import attendees, auth, event, internal
 
-# Create tables
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Event Management API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    health_checks = None
+    if replicas:
+        await replicas.check(config.READINESS_TIMEOUT_SECONDS)
+        health_checks = asyncio.create_task(
+            replicas.run_health_checks(
+                config.REPLICA_HEALTH_CHECK_SECONDS, config.READINESS_TIMEOUT_SECONDS
+            )
+        )
+    yield
+    if health_checks:
+        health_checks.cancel()
+
+
+app = FastAPI(
+    title="Event Management API",
+    lifespan=lifespan,
+    dependencies=[Depends(track_in_progress)],
+)
+app.add_middleware(PrometheusMiddleware)
+
+track_queries(async_engine.sync_engine, "primary")
+track_queries(engine, "sync")
+for index, replica in enumerate(replicas.engines):
+    track_queries(replica.sync_engine, f"replica{index}")
+
+if config.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(QueryBudgetMiddleware)
+    record_queries(async_engine.sync_engine)
+    for replica in replicas.engines:
+        record_queries(replica.sync_engine)
+
+
+def _pools():
+    pools = {"primary": async_engine.pool, "sync": engine.pool}
+    for index, replica in enumerate(replicas.engines):
+        pools[f"replica{index}"] = replica.pool
+    return pools
+
+
+register_runtime_collector(
+    _pools, {"user": user_cache.stats_dict, "event": event_cache.stats_dict}
+)
 
 # Include routers
 app.include_router(auth.router, prefix="/api")
@@ -19,3 +76,39 @@ app.include_router(internal.router, prefix="/api")
 @app.get("/health")
 async def health():
     return {"status": "OK"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
+
+
+async def _ping_database():
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: the database answers within READINESS_TIMEOUT_SECONDS.
+    Also reports the connection pools, so saturation shows up before requests
+    start timing out.
+    """
+    status_code, status = 200, "OK"
+    try:
+        await asyncio.wait_for(_ping_database(), config.READINESS_TIMEOUT_SECONDS)
+    except Exception:
+        status_code, status = 503, "Database unavailable"
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "status": status,
+            "pools": {
+                "async": pool_stats(async_engine.pool),
+                "sync": pool_stats(engine.pool),
+                "replicas": [pool_stats(replica.pool) for replica in replicas.engines],
+            },
+            "replicas": await replicas.check(config.READINESS_TIMEOUT_SECONDS),
+        },
+    )
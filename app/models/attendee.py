@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, ForeignKey, Integer
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import mapped_column, relationship
 
 from app.utils.mixins import BaseDBModel
@@ -6,6 +6,11 @@ from app.utils.mixins import BaseDBModel
 
 class Attendee(BaseDBModel):
     __tablename__ = "attendees"
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_attendees_event_id_user_id"),
+        # Keyset pagination order for per-event listings.
+        Index("ix_attendees_event_id_id", "event_id", "id"),
+    )
 
     user_id = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     event_id = mapped_column(Integer, ForeignKey("events.id"), nullable=False)
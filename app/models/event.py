@@ -1,12 +1,56 @@
-from sqlalchemy import DateTime, Enum, Integer, String
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+    case,
+    event,
+    func,
+    literal,
+    text,
+)
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import mapped_column, relationship
 
 from app.utils.constants import EventStatus
 from app.utils.mixins import BaseDBModel
 
+# Statuses set explicitly that time never overrides.
+FINAL_STATUSES = (EventStatus.completed, EventStatus.canceled)
+
+# Postgres text search configuration used for descriptions.
+SEARCH_CONFIG = "english"
+
+
+def derive_status(
+    status: Optional[EventStatus], start_time: datetime, end_time: datetime
+) -> EventStatus:
+    if status in FINAL_STATUSES:
+        return status
+    now = datetime.now()
+    if end_time < now:
+        return EventStatus.completed
+    if start_time <= now:
+        return EventStatus.ongoing
+    # A stored "ongoing" is only the scheduler's record of the time; an event
+    # moved back into the future is scheduled again.
+    return EventStatus.scheduled
+
 
 class Event(BaseDBModel):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination order for listings.
+        Index("ix_events_start_time_id", "start_time", "id"),
+        # Time-ordered lookups for the status transition scheduler.
+        Index("ix_events_status_start_time", "status", "start_time"),
+        Index("ix_events_status_end_time", "status", "end_time"),
+    )
 
     name = mapped_column(String(200), nullable=False)
     description = mapped_column(String)
@@ -15,5 +59,63 @@ class Event(BaseDBModel):
     location = mapped_column(String(255), nullable=False)
     max_attendees = mapped_column(Integer, nullable=False)
     status = mapped_column(Enum(EventStatus), default=EventStatus.scheduled)
+    # Denormalized attendee count, kept in step by register_attendee;
+    # migration 0002 backfills it for events created before it existed.
+    registered_count = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     attendees = relationship("Attendee", back_populates="event")
+
+    @hybrid_property
+    def current_status(self) -> EventStatus:
+        """Status derived from start_time/end_time as of now."""
+        return derive_status(self.status, self.start_time, self.end_time)
+
+    @current_status.inplace.expression
+    @classmethod
+    def _current_status_expression(cls):
+        # Compares against the time the expression is built: build it per query.
+        now = datetime.now()
+        status_type = cls.status.type
+        return case(
+            (cls.status.in_(FINAL_STATUSES), cls.status),
+            (cls.end_time < now, literal(EventStatus.completed, status_type)),
+            (cls.start_time <= now, literal(EventStatus.ongoing, status_type)),
+            else_=literal(EventStatus.scheduled, status_type),
+        )
+
+
+def description_search_vector():
+    """tsvector over description; must match ix_events_description_fts exactly."""
+    return func.to_tsvector(
+        text(f"'{SEARCH_CONFIG}'"),
+        func.coalesce(Event.__table__.c.description, text("''")),
+    )
+
+
+# Search indexes are Postgres-only: trigram GIN indexes for ILIKE/similarity
+# on name and location, and a full-text GIN index on description.
+Index(
+    "ix_events_name_trgm",
+    Event.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_events_location_trgm",
+    Event.location,
+    postgresql_using="gin",
+    postgresql_ops={"location": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_events_description_fts",
+    description_search_vector(),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    Event.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -1,135 +1,434 @@
 import traceback
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import Depends, HTTPException
-from sqlalchemy import func
+from sqlalchemy import Row, func, insert, or_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_dialect_name, get_uow
+from app.core.event_cache import EventSnapshot
+from app.core.replicas import on_replica
+from app.core.settings import config
+from app.core.user_cache import UserPrincipal
 from app.models.attendee import Attendee
 from app.models.event import Event, EventStatus
 from app.models.user import User
+from app.repositories.event_repo import EventRepository
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Columns returned by list_attendees, as plain dicts ready for the response.
+ATTENDEE_LIST_COLUMNS = (
+    Attendee.id,
+    Attendee.user_id,
+    Attendee.event_id,
+    Attendee.check_in_status,
+    Attendee.created_at,
+    Attendee.updated_at,
+)
+
+# Columns written by the attendee export, joined with the attendee's user.
+ATTENDEE_EXPORT_COLUMNS = (
+    Attendee.id.label("attendee_id"),
+    Attendee.user_id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    Attendee.check_in_status,
+    Attendee.created_at.label("registered_at"),
+)
+
+# INSERT constructs supporting ON CONFLICT DO NOTHING, per dialect.
+CONFLICT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
 
 
 class AttendeeRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def register_attendee(self, event_id: int, user: User):
+    async def register_attendee(self, event_id: int, user: UserPrincipal):
+        user_id = user.id
         try:
-            event = await self.get_event(event_id)
-            if not event:
-                return None, "Event not found"
-
-            if event.status == EventStatus.completed:
-                return None, "Cannot register for completed event"
-
-            existing_query = select(Attendee).where(
-                Attendee.event_id == event_id,
-                Attendee.user_id == user.id,
+            # Seat and attendee row go in together or not at all, without
+            # ending the request's transaction.
+            savepoint = await self.db.begin_nested()
+            # Reserve a seat with one conditional increment; the database
+            # enforces capacity, so no COUNT(*) over attendees is needed.
+            reserved = await self.db.execute(
+                update(Event)
+                .where(
+                    Event.id == event_id,
+                    Event.current_status != EventStatus.completed,
+                    Event.registered_count < Event.max_attendees,
+                )
+                .values(registered_count=Event.registered_count + 1)
+                .returning(Event.id)
+                .execution_options(synchronize_session=False)
             )
-            existing = await self.get_attendee(existing_query)
-            if existing:
-                return None, "Attendee already registered"
-
-            current_count = await self.get_attendee_count(event_id)
-            if current_count >= event.max_attendees:
-                return None, "Max attendees reached"
+            if reserved.scalar_one_or_none() is None:
+                await savepoint.rollback()
+                return None, await self._registration_error(event_id, user_id)
 
-            new_attendee = Attendee(event_id=event_id, user_id=user.id)
-            return await self.save_attendee(new_attendee), None
+            try:
+                new_attendee = await self.db.scalar(
+                    insert(Attendee)
+                    .values(event_id=event_id, user_id=user_id)
+                    .returning(Attendee)
+                )
+            except IntegrityError:
+                # uq_attendees_event_id_user_id; rolling back frees the seat.
+                await savepoint.rollback()
+                return None, "Attendee already registered"
+            await savepoint.commit()
+            return new_attendee, None
         except Exception as e:
             traceback.print_exc()
             return None, str(e)
 
+    async def register_batch(
+        self,
+        event_id: int,
+        user_ids: List[int],
+        emails: List[str],
+        all_or_nothing: bool = False,
+    ) -> dict:
+        """
+        Register many users for one event with a fixed number of statements:
+        lock the event row, resolve the users together with any registration
+        they already have, then insert the new rows in one multi-row INSERT
+        ... ON CONFLICT DO NOTHING and reserve their seats in one UPDATE.
+
+        Each requested id or email gets an entry in "success" or "failed".
+        With `all_or_nothing`, nobody is registered unless everybody can be.
+        """
+        event = (
+            await self.db.execute(
+                select(
+                    Event.current_status,
+                    Event.registered_count,
+                    Event.max_attendees,
+                )
+                .where(Event.id == event_id)
+                .with_for_update()
+            )
+        ).one_or_none()
+        if event is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        if event.current_status == EventStatus.completed:
+            raise HTTPException(
+                status_code=400, detail="Cannot register for completed event"
+            )
+
+        users = await self.db.execute(
+            select(User.id, User.email, Attendee.id.label("attendee_id"))
+            .outerjoin(
+                Attendee,
+                (Attendee.user_id == User.id) & (Attendee.event_id == event_id),
+            )
+            .where(or_(User.id.in_(set(user_ids)), User.email.in_(set(emails))))
+        )
+        by_key = {}
+        for user in users:
+            by_key[("user_id", user.id)] = user
+            by_key[("email", user.email)] = user
+
+        result = {"success": [], "failed": []}
+        pending, seen = [], set()
+        requested = [("user_id", user_id) for user_id in user_ids]
+        requested += [("email", email) for email in emails]
+        for field, value in requested:
+            entry = {field: value}
+            user = by_key.get((field, value))
+            if user is None:
+                result["failed"].append({**entry, "message": "User not found"})
+            elif user.id in seen:
+                result["failed"].append({**entry, "message": "Listed more than once"})
+            elif user.attendee_id is not None:
+                seen.add(user.id)
+                result["failed"].append(
+                    {**entry, "message": "Attendee already registered"}
+                )
+            else:
+                seen.add(user.id)
+                pending.append((entry, user.id))
+
+        free_seats = max(0, event.max_attendees - event.registered_count)
+        for entry, _ in pending[free_seats:]:
+            result["failed"].append({**entry, "message": "Max attendees reached"})
+        pending = pending[:free_seats]
+
+        if all_or_nothing and result["failed"]:
+            return self._batch_rolled_back(result, pending)
+        if not pending:
+            return result
+
+        savepoint = await self.db.begin_nested()
+        conflict_insert = CONFLICT_INSERTS[get_dialect_name(self.db)]
+        inserted = await self.db.execute(
+            conflict_insert(Attendee)
+            .values(
+                [{"event_id": event_id, "user_id": user_id} for _, user_id in pending]
+            )
+            .on_conflict_do_nothing(index_elements=["event_id", "user_id"])
+            .returning(Attendee.user_id)
+        )
+        inserted_ids = set(inserted.scalars().all())
+        # Rows missing from RETURNING were registered concurrently.
+        raced = [
+            (entry, user_id)
+            for entry, user_id in pending
+            if user_id not in inserted_ids
+        ]
+        if all_or_nothing and raced:
+            await savepoint.rollback()
+            for entry, _ in raced:
+                result["failed"].append(
+                    {**entry, "message": "Attendee already registered"}
+                )
+            return self._batch_rolled_back(result, pending, raced)
+
+        reserved = await self.db.execute(
+            update(Event)
+            .where(
+                Event.id == event_id,
+                Event.registered_count + len(inserted_ids) <= Event.max_attendees,
+            )
+            .values(registered_count=Event.registered_count + len(inserted_ids))
+            .returning(Event.id)
+            .execution_options(synchronize_session=False)
+        )
+        if reserved.scalar_one_or_none() is None:
+            # Seats went to concurrent registrations since the event was read.
+            await savepoint.rollback()
+            for entry, _ in pending:
+                result["failed"].append({**entry, "message": "Max attendees reached"})
+            return result
+        await savepoint.commit()
+
+        for entry, user_id in pending:
+            if user_id in inserted_ids:
+                result["success"].append(
+                    {**entry, "message": "Registered successfully"}
+                )
+            else:
+                result["failed"].append(
+                    {**entry, "message": "Attendee already registered"}
+                )
+        return result
+
+    @staticmethod
+    def _batch_rolled_back(result: dict, pending: list, skip: list = ()) -> dict:
+        skipped = {user_id for _, user_id in skip}
+        for entry, user_id in pending:
+            if user_id not in skipped:
+                result["failed"].append(
+                    {**entry, "message": "Not registered, the batch was rolled back"}
+                )
+        return result
+
+    async def _registration_error(self, event_id: int, user_id: int) -> str:
+        event = await self.get_event(event_id)
+        if not event:
+            return "Event not found"
+        if event.current_status == EventStatus.completed:
+            return "Cannot register for completed event"
+        existing_query = select(Attendee.id).where(
+            Attendee.event_id == event_id,
+            Attendee.user_id == user_id,
+        )
+        if await self.get_attendee(existing_query):
+            return "Attendee already registered"
+        return "Max attendees reached"
+
     async def check_in_attendee(self, user_id: int, event_id: int):
         event = await self.get_event(event_id)
         if not event:
             return None
-        if event.status == EventStatus.completed:
+        if event.current_status == EventStatus.completed:
             return None
 
-        query = select(Attendee).where(
-            Attendee.user_id == user_id, Attendee.event_id == event_id
+        result = await self.db.execute(
+            update(Attendee)
+            .where(Attendee.user_id == user_id, Attendee.event_id == event_id)
+            .values(check_in_status=True)
+            .returning(Attendee)
         )
-        attendee = await self.get_attendee(query)
-        if attendee:
-            attendee.check_in_status = True
-            return await self.save_attendee(attendee)
-        return None
+        return result.scalar_one_or_none()
+
+    async def bulk_check_in_by_emails(
+        self, event_id: int, email_batches: AsyncIterable[List[str]]
+    ):
+        await self.get_open_event(event_id)
+
+        result = {"success": [], "failed": []}
+        checked_in = set()
+        async for emails in email_batches:
+            await self._check_in_email_chunk(event_id, emails, result, checked_in)
+        return result
 
-    async def bulk_check_in_by_emails(self, event_id: int, emails: List[str]):
+    async def bulk_check_in_chunks(
+        self, event_id: int, email_batches: AsyncIterable[List[str]]
+    ) -> AsyncIterator[dict]:
+        """
+        Like bulk_check_in_by_emails, but commits each batch and yields its
+        result as soon as it is done, for callers that report progress.
+        """
+        await self.get_open_event(event_id)
+
+        checked_in = set()
+        async for emails in email_batches:
+            result = {"success": [], "failed": []}
+            await self._check_in_email_chunk(event_id, emails, result, checked_in)
+            await self.db.commit()
+            yield result
+
+    async def get_open_event(self, event_id: int) -> EventSnapshot:
+        """The event, or an HTTPException if it cannot take check-ins."""
         event = await self.get_event(event_id)
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
-        if event.status == EventStatus.completed:
+        if event.current_status == EventStatus.completed:
             raise HTTPException(status_code=400, detail="Event is completed")
+        return event
 
-        result = {"success": [], "failed": []}
-        for email in emails:
-            attendee_query = (
-                select(Attendee)
-                .join(User, Attendee.user)
-                .where(Attendee.event_id == event_id, User.email == email)
+    async def _check_in_email_chunk(
+        self, event_id: int, emails: List[str], result: dict, checked_in: set
+    ):
+        """
+        Check in one chunk of emails with a single lookup and a single UPDATE.
+        `checked_in` carries the emails checked in by earlier chunks, so that
+        duplicates in the upload are reported like the per-row flow did.
+        """
+        lookup = await self.db.execute(
+            select(User.email, Attendee.id)
+            .join(User, Attendee.user)
+            .where(Attendee.event_id == event_id, User.email.in_(set(emails)))
+        )
+        attendee_ids = {email: attendee_id for email, attendee_id in lookup}
+
+        updated_ids = set()
+        pending_ids = [
+            attendee_ids[email]
+            for email in set(emails)
+            if email in attendee_ids and email not in checked_in
+        ]
+        if pending_ids:
+            updated = await self.db.execute(
+                update(Attendee)
+                .where(
+                    Attendee.id.in_(pending_ids),
+                    Attendee.check_in_status.is_not(True),
+                )
+                .values(check_in_status=True)
+                .returning(Attendee.id)
+                .execution_options(synchronize_session=False)
             )
-            attendee = await self.get_attendee(attendee_query)
-            if attendee:
-                if not attendee.check_in_status:
-                    attendee.check_in_status = True
-                    updated_attendee = await self.save_attendee(attendee)
-                    result["success"].append(
-                        {
-                            "email": updated_attendee.user.email,
-                            "message": "Check-in successful.",
-                        }
-                    )
-                else:
-                    result["failed"].append(
-                        {"email": email, "message": "Attendee already checked in."}
-                    )
-            else:
+            updated_ids = set(updated.scalars().all())
+
+        for email in emails:
+            if email not in attendee_ids:
                 result["failed"].append(
                     {"email": email, "message": "No attendee found for this email."}
                 )
-
-        return result
+            elif email not in checked_in and attendee_ids[email] in updated_ids:
+                checked_in.add(email)
+                result["success"].append(
+                    {"email": email, "message": "Check-in successful."}
+                )
+            else:
+                checked_in.add(email)
+                result["failed"].append(
+                    {"email": email, "message": "Attendee already checked in."}
+                )
 
     async def list_attendees(
-        self, event_id: int, check_in_status: Optional[bool] = None
-    ):
+        self,
+        event_id: int,
+        check_in_status: Optional[bool] = None,
+        limit: int = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         event = await self.get_event(event_id)
         if not event:
-            return []
+            return [], None
+
+        query = select(*ATTENDEE_LIST_COLUMNS).where(
+            *self._list_conditions(event_id, check_in_status)
+        )
 
-        query = select(Attendee).where(Attendee.event_id == event_id)
+        after = decode_cursor(cursor)
+        if after:
+            try:
+                query = query.where(Attendee.id > int(after["id"]))
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        query = query.order_by(Attendee.id).limit(limit + 1)
+        result = await self.db.execute(on_replica(query))
+        attendees = [dict(row) for row in result.mappings()]
+
+        next_cursor = None
+        if len(attendees) > limit:
+            attendees = attendees[:limit]
+            next_cursor = encode_cursor({"id": attendees[-1]["id"]})
+        return attendees, next_cursor
+
+    async def iter_export_rows(
+        self, event_id: int, check_in_status: Optional[bool] = None
+    ) -> AsyncIterator[List[Row]]:
+        """
+        ATTENDEE_EXPORT_COLUMNS rows in batches of EXPORT_BATCH_SIZE, read from
+        a server-side cursor so memory stays flat whatever the event size.
+        """
+        query = (
+            select(*ATTENDEE_EXPORT_COLUMNS)
+            .join(User, Attendee.user)
+            .where(*self._list_conditions(event_id, check_in_status))
+            .order_by(Attendee.id)
+            .execution_options(yield_per=config.EXPORT_BATCH_SIZE)
+        )
+        result = await self.db.stream(on_replica(query))
+        async for rows in result.partitions():
+            yield rows
+
+    async def list_attendees_fingerprint(
+        self, event_id: int, check_in_status: Optional[bool] = None
+    ) -> Tuple:
+        """Row count and latest updated_at of the filtered attendee set."""
+        query = select(func.count(Attendee.id), func.max(Attendee.updated_at)).where(
+            *self._list_conditions(event_id, check_in_status)
+        )
+        result = await self.db.execute(on_replica(query))
+        return tuple(result.one())
+
+    def _list_conditions(self, event_id: int, check_in_status: Optional[bool]):
+        conditions = [Attendee.event_id == event_id]
         if check_in_status is not None:
-            query = query.where(Attendee.check_in_status == check_in_status)
-        result = self.db.execute(query)
-        return result.scalars().all()
+            conditions.append(Attendee.check_in_status == check_in_status)
+        return conditions
 
-    async def get_event(self, event_id: int):
-        query = select(Event).where(Event.id == event_id)
-        result = self.db.execute(query)
-        return result.scalar_one_or_none()
+    async def get_event(self, event_id: int) -> Optional[EventSnapshot]:
+        return await EventRepository(self.db).get_event_snapshot(event_id)
 
     async def get_attendee(self, query):
-        result = self.db.execute(query)
+        result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
     async def get_attendee_count(self, event_id: int) -> int:
         query = select(func.count(Attendee.event_id)).where(
             Attendee.event_id == event_id
         )
-        result = self.db.execute(query)
+        result = await self.db.execute(on_replica(query))
         return result.scalar() or 0
 
     async def save_attendee(self, attendee: Attendee):
         self.db.add(attendee)
-        self.db.commit()
-        self.db.refresh(attendee)
+        await self.db.flush()
         return attendee
 
 
-def get_attendee_repo(db: Session = Depends(get_db)):
+def get_attendee_repo(db: AsyncSession = Depends(get_uow, scope="function")):
     return AttendeeRepository(db)
@@ -1,17 +1,59 @@
 from datetime import datetime
-from typing import List, Optional
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import Depends, HTTPException
-from sqlalchemy import and_, select, update
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Row,
+    Select,
+    Update,
+    and_,
+    case,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.models.event import Event, EventStatus
+from app.core.database import after_commit, get_dialect_name, get_uow
+from app.core.event_cache import EventSnapshot, event_cache
+from app.core.replicas import on_replica
+from app.core.settings import config
+from app.models.event import (
+    SEARCH_CONFIG,
+    Event,
+    EventStatus,
+    description_search_vector,
+)
 from app.schemas.event import EventCreate, EventUpdate
+from app.utils.pagination import decode_cursor, encode_cursor
+
+LIKE_ESCAPE = "\\"
+
+
+def event_list_columns() -> tuple:
+    """
+    Columns read by the listing endpoints; rows feed serialize_event_row
+    directly instead of hydrating Event instances. Built per query because the
+    derived status compares against the time the expression is created.
+    """
+    return (
+        Event.id,
+        Event.name,
+        Event.description,
+        Event.start_time,
+        Event.end_time,
+        Event.location,
+        Event.max_attendees,
+        Event.current_status.label("status"),
+    )
 
 
 class EventRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_event(self, event_data: EventCreate) -> Event:
@@ -30,7 +72,7 @@ class EventRepository:
                 Event.end_time == end_datetime,
             )
         )
-        existing_event = self.db.execute(query).scalar_one_or_none()
+        existing_event = (await self.db.execute(query)).scalar_one_or_none()
         if existing_event:
             raise HTTPException(
                 status_code=400, detail="An event with the same details already exists"
@@ -40,49 +82,175 @@ class EventRepository:
         event_dict.pop("date")
         event_dict.update({"start_time": start_datetime, "end_time": end_datetime})
 
-        new_event = Event(**event_dict)
-        self.db.add(new_event)
-        self.db.commit()
-        self.db.refresh(new_event)
-        return new_event
+        return await self.db.scalar(insert(Event).values(**event_dict).returning(Event))
 
     async def list_events(
         self,
         status: Optional[EventStatus] = None,
         location: Optional[str] = None,
         date: Optional[datetime] = None,
-    ) -> List[Event]:
-        now = datetime.now()
+        limit: int = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        q: Optional[str] = None,
+    ) -> Tuple[List[Row], Optional[str]]:
+        query = select(*event_list_columns())
+        conditions = self._list_conditions(status, location, date, q)
 
-        query = (
-            update(Event)
-            .where(and_(Event.status != EventStatus.completed, Event.end_time < now))
-            .values(status=EventStatus.completed)
+        after = decode_cursor(cursor)
+        if after:
+            try:
+                after_start = datetime.fromisoformat(after["start_time"])
+                after_id = int(after["id"])
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            conditions.append(
+                or_(
+                    Event.start_time > after_start,
+                    and_(Event.start_time == after_start, Event.id > after_id),
+                )
+            )
+
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        query = query.order_by(Event.start_time, Event.id).limit(limit + 1)
+        result = await self.db.execute(on_replica(query))
+        events = result.all()
+
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            last = events[-1]
+            next_cursor = encode_cursor(
+                {"start_time": last.start_time.isoformat(), "id": last.id}
+            )
+        return events, next_cursor
+
+    async def list_events_fingerprint(
+        self,
+        status: Optional[EventStatus] = None,
+        location: Optional[str] = None,
+        date: Optional[datetime] = None,
+        q: Optional[str] = None,
+    ) -> Tuple:
+        """
+        Cheap aggregate that changes whenever the filtered set does: row count,
+        latest updated_at, and a sum that grows with every time-driven status
+        transition (which does not touch updated_at).
+        """
+        derived_status = Event.current_status
+        query = select(
+            func.count(Event.id),
+            func.max(Event.updated_at),
+            func.sum(
+                case(
+                    (derived_status == EventStatus.ongoing, 1),
+                    (derived_status == EventStatus.completed, 2),
+                    else_=0,
+                )
+            ),
         )
-        self.db.execute(query)
-        self.db.commit()
+        conditions = self._list_conditions(status, location, date, q)
+        if conditions:
+            query = query.where(and_(*conditions))
+        result = await self.db.execute(on_replica(query))
+        return tuple(result.one())
 
-        query = select(Event)
+    def _list_conditions(
+        self,
+        status: Optional[EventStatus],
+        location: Optional[str],
+        date: Optional[datetime],
+        q: Optional[str],
+    ) -> list:
         conditions = []
-
         if status:
-            conditions.append(Event.status == status)
+            conditions.append(Event.current_status == status)
         if location:
             conditions.append(Event.location.ilike(f"%{location}%"))
+        if q:
+            conditions.append(self._search_condition(q))
         if date:
             conditions.extend([Event.start_time <= date, Event.end_time >= date])
+        return conditions
 
-        if conditions:
-            query = query.where(and_(*conditions))
+    async def search_events(
+        self,
+        q: str,
+        limit: int = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Events matching `q`, best match first."""
+        after = decode_cursor(cursor)
+        try:
+            offset = int(after["offset"]) if after else 0
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        query = (
+            select(*event_list_columns())
+            .where(self._search_condition(q))
+            .order_by(self._search_rank(q).desc(), Event.id)
+            .offset(offset)
+            .limit(limit + 1)
+        )
+        result = await self.db.execute(on_replica(query))
+        events = result.all()
+
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = encode_cursor({"offset": offset + limit})
+        return events, next_cursor
 
-        result = self.db.execute(query)
-        return result.scalars().all()
+    def _search_condition(self, q: str):
+        pattern = like_pattern(q)
+        if get_dialect_name(self.db) == "postgresql":
+            # ILIKE and % both use the trigram indexes, @@ the full-text one.
+            tsquery = func.plainto_tsquery(text(f"'{SEARCH_CONFIG}'"), q)
+            return or_(
+                Event.name.ilike(pattern, escape=LIKE_ESCAPE),
+                Event.location.ilike(pattern, escape=LIKE_ESCAPE),
+                Event.name.op("%")(q),
+                Event.location.op("%")(q),
+                description_search_vector().op("@@")(tsquery),
+            )
+        return or_(
+            Event.name.ilike(pattern, escape=LIKE_ESCAPE),
+            Event.location.ilike(pattern, escape=LIKE_ESCAPE),
+            Event.description.ilike(pattern, escape=LIKE_ESCAPE),
+        )
+
+    def _search_rank(self, q: str):
+        if get_dialect_name(self.db) == "postgresql":
+            tsquery = func.plainto_tsquery(text(f"'{SEARCH_CONFIG}'"), q)
+            return func.greatest(
+                func.similarity(Event.name, q), func.similarity(Event.location, q)
+            ) + func.ts_rank(description_search_vector(), tsquery)
+        # Portable fallback: weight where the match was found.
+        pattern = like_pattern(q)
+        return (
+            case((Event.name.ilike(pattern, escape=LIKE_ESCAPE), 3), else_=0)
+            + case((Event.location.ilike(pattern, escape=LIKE_ESCAPE), 2), else_=0)
+            + case((Event.description.ilike(pattern, escape=LIKE_ESCAPE), 1), else_=0)
+        )
 
     async def get_event(self, event_id: int) -> Optional[Event]:
         query = select(Event).where(Event.id == event_id)
-        result = self.db.execute(query)
+        result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_event_snapshot(self, event_id: int) -> Optional[EventSnapshot]:
+        """Read-through lookup via event_cache, for paths that only read."""
+        snapshot, token = await event_cache.get(event_id)
+        if snapshot is None:
+            event = await self.get_event(event_id)
+            if not event:
+                return None
+            snapshot = EventSnapshot.from_event(event)
+            await event_cache.set(event_id, snapshot, token)
+        return snapshot
+
     async def update_event(
         self, event_id: int, event_update: EventUpdate
     ) -> Optional[Event]:
@@ -109,8 +277,8 @@ class EventRepository:
             .values(**update_data)
             .returning(Event)
         )
-        result = self.db.execute(query)
-        self.db.commit()
+        result = await self.db.execute(query)
+        after_commit(self.db, partial(event_cache.invalidate, event_id))
         return result.scalar_one()
 
     async def delete_event(self, event_id: int) -> Event:
@@ -118,21 +286,69 @@ class EventRepository:
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
 
-        self.db.delete(event)
-        self.db.commit()
+        await self.db.delete(event)
+        await self.db.flush()
+        after_commit(self.db, partial(event_cache.invalidate, event_id))
         return event
 
-    async def check_events_status(self):
-        now = datetime.now()
-        query = (
+    async def check_events_status(self) -> Dict[str, List[int]]:
+        transitioned = {}
+        for new_status, query in due_status_transitions(datetime.now()).items():
+            result = await self.db.execute(query)
+            transitioned[new_status.value] = result.scalars().all()
+        for event_ids in transitioned.values():
+            for event_id in event_ids:
+                after_commit(self.db, partial(event_cache.invalidate, event_id))
+        return transitioned
+
+
+def like_pattern(value: str) -> str:
+    """Substring LIKE pattern with wildcards in `value` escaped by LIKE_ESCAPE."""
+    for char in (LIKE_ESCAPE, "%", "_"):
+        value = value.replace(char, LIKE_ESCAPE + char)
+    return f"%{value}%"
+
+
+def due_status_transitions(now: datetime) -> Dict[EventStatus, Update]:
+    """
+    UPDATE statements for the status transitions due at `now`, in the order
+    they must run. Both only touch due rows, through the (status, start_time)
+    and (status, end_time) indexes.
+    """
+    return {
+        EventStatus.ongoing: (
+            update(Event)
+            .where(
+                Event.status == EventStatus.scheduled,
+                Event.start_time <= now,
+                Event.end_time >= now,
+            )
+            .values(status=EventStatus.ongoing)
+            .returning(Event.id)
+            .execution_options(synchronize_session=False)
+        ),
+        EventStatus.completed: (
             update(Event)
-            .where(and_(Event.end_time < now, Event.status != EventStatus.completed))
+            .where(
+                Event.status.in_([EventStatus.scheduled, EventStatus.ongoing]),
+                Event.end_time < now,
+            )
             .values(status=EventStatus.completed)
-            .returning(Event)
-        )
-        self.db.execute(query)
-        self.db.commit()
+            .returning(Event.id)
+            .execution_options(synchronize_session=False)
+        ),
+    }
+
+
+def next_transition_queries() -> List[Select]:
+    """Queries for the earliest pending start and end transition times."""
+    return [
+        select(func.min(Event.start_time)).where(Event.status == EventStatus.scheduled),
+        select(func.min(Event.end_time)).where(
+            Event.status.in_([EventStatus.scheduled, EventStatus.ongoing])
+        ),
+    ]
 
 
-def get_event_repo(db: Session = Depends(get_db)):
+def get_event_repo(db: AsyncSession = Depends(get_uow, scope="function")):
     return EventRepository(db)
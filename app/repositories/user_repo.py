@@ -1,43 +1,51 @@
+from functools import partial
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.security import get_password_hash, verify_password
+from app.core.database import after_commit, get_uow
+from app.core.replicas import on_replica
+from app.core.security import password_hasher
 from app.core.settings import config
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.user import UserCreate
 
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_user(self, user_data: UserCreate) -> User:
-        new_user = User(
-            username=user_data.username,
-            email=user_data.email,
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-            phone_number=user_data.phone_number,
-            password=get_password_hash(user_data.password),
+        query = (
+            insert(User)
+            .values(
+                username=user_data.username,
+                email=user_data.email,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                phone_number=user_data.phone_number,
+                password=await password_hasher.hash(user_data.password),
+            )
+            .returning(User)
         )
-        self.db.add(new_user)
-        self.db.commit()
-        self.db.refresh(new_user)
-        return new_user
+        return await self.db.scalar(query)
 
     async def get_user_by_username(self, username: str) -> User:
-        result = self.db.execute(select(User).where(User.username == username))
+        result = await self.db.execute(select(User).where(User.username == username))
         return result.scalar_one_or_none()
 
-    async def get_user_by_email(self, email: str) -> User:
-        result = self.db.execute(select(User).where(User.email == email))
+    async def get_user_by_email(self, email: str, replica: bool = False) -> User:
+        query = select(User).where(User.email == email)
+        result = await self.db.execute(on_replica(query) if replica else query)
         return result.scalar_one_or_none()
 
     async def get_user(self, user_id: int) -> User:
-        result = self.db.execute(select(User).where(User.id == user_id))
+        result = await self.db.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
     async def register_user(self, user_data: UserCreate) -> User:
@@ -53,9 +61,20 @@ class UserRepository:
             else await self.get_user_by_username(identifier)
         )
 
-        if not user or not verify_password(password, user.password):
+        if not user:
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+
+        valid, new_hash = await password_hasher.verify_and_update(
+            password, user.password
+        )
+        if not valid:
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
+        if new_hash:
+            # Transparent rehash after BCRYPT_ROUNDS changed.
+            user.password = new_hash
+            await self.db.flush()
+
         return user
 
     async def logout_user(self, token: str) -> None:
@@ -72,17 +91,12 @@ class UserRepository:
                     detail="Could not validate credentials",
                 )
 
-            user = await self.get_user(user_id)
+            user = await self._bump_token_version(user_id, 1)
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User not found",
                 )
-
-            user.token_version += 1
-            self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
         except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -90,17 +104,30 @@ class UserRepository:
             )
 
     async def update_token_version(self, user_id: int, increment: bool = True) -> User:
-        user = await self.get_user(user_id)
+        user = await self._bump_token_version(user_id, 1 if increment else 0)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
+        return user
 
-        if increment:
-            user.token_version += 1
-        self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+    async def _bump_token_version(self, user_id: int, step: int) -> Optional[User]:
+        """
+        Add `step` to the user's token_version in one UPDATE ... RETURNING and
+        drop the cached principal of the previous version once committed.
+        """
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + step)
+            .returning(User)
+        )
+        user = result.scalar_one_or_none()
+        if user:
+            previous_version = user.token_version - step
+            after_commit(
+                self.db, partial(user_cache.invalidate, user.email, previous_version)
+            )
         return user
 
 
-def get_user_repo(db: Session = Depends(get_db)):
+def get_user_repo(db: AsyncSession = Depends(get_uow, scope="function")):
     return UserRepository(db)
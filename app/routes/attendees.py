@@ -1,23 +1,60 @@
-from io import BytesIO
 from typing import Optional
 
-import pandas as pd
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.core.dependency import get_current_user
-from app.models.user import User
-from app.repositories.attendee_repo import AttendeeRepository, get_attendee_repo
-from app.utils.response_format import APIResponse
+from app.core.checkin_jobs import CheckInJobStore
+from app.core.dependency import get_current_user, is_admin
+from app.core.idempotency import IdempotentRoute, idempotent
+from app.core.query_budget import query_budget
+from app.core.rate_limit import limit_by_ip, limit_by_user
+from app.core.redis import get_redis
+from app.core.settings import config
+from app.core.user_cache import UserPrincipal
+from app.repositories.attendee_repo import (
+    ATTENDEE_EXPORT_COLUMNS,
+    AttendeeRepository,
+    get_attendee_repo,
+)
+from app.schemas.attendees import AttendeeBatchRegister
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.file_readers import check_upload_type, iter_email_batches, read_upload
+from app.utils.file_writers import EXPORT_MEDIA_TYPES, iter_export
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.response_format import (
+    APIResponse,
+    PaginatedAPIResponse,
+    paginated_response,
+)
 
-router = APIRouter(prefix="/attendees", tags=["Attendees"])
+router = APIRouter(prefix="/attendees", tags=["Attendees"], route_class=IdempotentRoute)
 
 
-@router.post("/{event_id}/register", response_model=APIResponse)
+@router.post(
+    "/{event_id}/register",
+    response_model=APIResponse,
+    dependencies=[
+        Depends(limit_by_ip("registration", config.RATE_LIMIT_REGISTRATION_PER_IP)),
+        Depends(limit_by_user("registration", config.RATE_LIMIT_REGISTRATION_PER_USER)),
+    ],
+)
+@idempotent
+@query_budget(6)
 async def register_attendee_route(
     event_id: int,
     attendee_repo: AttendeeRepository = Depends(get_attendee_repo),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
 
     attendee, error = await attendee_repo.register_attendee(event_id, current_user)
@@ -29,11 +66,63 @@ async def register_attendee_route(
     )
 
 
+@router.post(
+    "/{event_id}/register_batch",
+    response_model=APIResponse,
+    dependencies=[
+        Depends(
+            limit_by_user(
+                "registration_batch", config.RATE_LIMIT_BATCH_REGISTRATION_PER_USER
+            )
+        ),
+    ],
+)
+@idempotent
+@query_budget(7)
+async def register_batch_route(
+    event_id: int,
+    batch: AttendeeBatchRegister,
+    attendee_repo: AttendeeRepository = Depends(get_attendee_repo),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Register a group of users, given by id and/or email, in one transaction.
+    Example body:
+        {"user_ids": [12, 15], "emails": ["person1@example.com"],
+         "all_or_nothing": false}
+
+    Reports an outcome per listed user. With all_or_nothing a batch that
+    cannot be registered in full registers nobody and answers 409. Only
+    admins may list users other than themselves.
+    """
+    if not (is_admin(current_user) or batch.lists_only(current_user)):
+        raise HTTPException(
+            status_code=403,
+            detail="Only admins can register other users",
+        )
+    result = await attendee_repo.register_batch(
+        event_id, batch.user_ids, batch.emails, batch.all_or_nothing
+    )
+    if batch.all_or_nothing and result["failed"]:
+        return JSONResponse(
+            status_code=409,
+            content=APIResponse(
+                message="No attendees registered", data=result
+            ).model_dump(),
+        )
+    return APIResponse(
+        message=f"{len(result['success'])} attendees registered",
+        data=result,
+    )
+
+
 @router.post("/{event_id}/checkin", response_model=APIResponse, status_code=200)
+@idempotent
+@query_budget(3)
 async def check_in_attendee_route(
     event_id: int,
     attendee_repo: AttendeeRepository = Depends(get_attendee_repo),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     attendee = await attendee_repo.check_in_attendee(current_user.id, event_id)
     if not attendee:
@@ -49,47 +138,146 @@ async def check_in_attendee_route(
 @router.post("/{event_id}/checkin_bulk", response_model=APIResponse)
 async def check_in_attendees_bulk(
     event_id: int,
+    response: Response,
     file: UploadFile = File(...),
+    mode: str = Query("sync", pattern="^(sync|async)$"),
     attendee_repo: AttendeeRepository = Depends(get_attendee_repo),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
-    Expects a CSV or Excel file containing a list of attendee emails to check in.
+    Expects a CSV or Excel (.xlsx) file containing a list of attendee emails to
+    check in. The file is streamed in batches of BULK_CHECKIN_CHUNK_SIZE emails.
     Example CSV/Excel content:
         email
         person1@example.com
         person2@example.com
+
+    With mode=async the file is stored and checked in by a Celery worker; the
+    response is a 202 with a job id to poll at /attendees/jobs/{job_id}.
     """
-    contents = await file.read()
+    if mode == "async":
+        redis = get_redis()
+        if redis is None:
+            raise HTTPException(
+                status_code=503, detail="Background check-in is not available"
+            )
+        check_upload_type(file.filename)
+        await attendee_repo.get_open_event(event_id)
+        content = await read_upload(file, config.CHECKIN_JOB_MAX_UPLOAD_BYTES)
 
-    if file.filename.endswith(".csv"):
-        df = pd.read_csv(BytesIO(contents))
-    elif file.filename.endswith((".xls", ".xlsx")):
-        df = pd.read_excel(BytesIO(contents))
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type, Only CSV and Excel are supported",
+        # Imported here so API workers only load Celery once a job is queued.
+        from app.tasks.tasks import process_bulk_check_in
+
+        job_id = await CheckInJobStore(redis).create(
+            event_id, current_user.id, file.filename, content
         )
+        # Off the event loop: publishing blocks, and in eager mode the task
+        # runs right here and calls asyncio.run itself.
+        await run_in_threadpool(process_bulk_check_in.delay, job_id)
+        response.status_code = 202
+        return APIResponse(message="Check-in job queued", data={"job_id": job_id})
 
-    emails = df["email"].dropna().tolist()
+    email_batches = iter_email_batches(
+        file, config.BULK_CHECKIN_CHUNK_SIZE, config.BULK_CHECKIN_MAX_ROWS
+    )
 
-    result = await attendee_repo.bulk_check_in_by_emails(event_id, emails)
+    result = await attendee_repo.bulk_check_in_by_emails(event_id, email_batches)
     return APIResponse(
         message="Check-in successful",
         data=jsonable_encoder(result),
     )
 
 
-@router.get("/{event_id}/list", response_model=APIResponse)
+@router.get("/{event_id}/list", response_model=PaginatedAPIResponse)
+@query_budget(4)
 async def list_attendees_route(
     event_id: int,
     check_in_status: Optional[bool] = None,
+    limit: int = Query(
+        config.PAGINATION_DEFAULT_LIMIT, ge=1, le=config.PAGINATION_MAX_LIMIT
+    ),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     attendee_repo: AttendeeRepository = Depends(get_attendee_repo),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    attendees = await attendee_repo.list_attendees(event_id, check_in_status)
-    return APIResponse(
-        message="Attendees listed successfully",
-        data=jsonable_encoder(attendees),
+    fingerprint = await attendee_repo.list_attendees_fingerprint(
+        event_id, check_in_status
+    )
+    etag = make_etag(
+        "attendees", event_id, check_in_status, limit, cursor, *fingerprint
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    attendees, next_cursor = await attendee_repo.list_attendees(
+        event_id, check_in_status, limit, cursor
+    )
+    return paginated_response(
+        "Attendees listed successfully",
+        attendees,
+        next_cursor,
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/{event_id}/export")
+@query_budget(3)
+async def export_attendees_route(
+    event_id: int,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|xlsx|ndjson)$"),
+    check_in_status: Optional[bool] = None,
+    attendee_repo: AttendeeRepository = Depends(get_attendee_repo),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Stream every attendee of the event, with the user's email and name, as
+    CSV, Excel (.xlsx) or newline-delimited JSON.
+    """
+    event = await attendee_repo.get_event(event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    columns = [column.key for column in ATTENDEE_EXPORT_COLUMNS]
+    rows = attendee_repo.iter_export_rows(event_id, check_in_status)
+    filename = f"event_{event_id}_attendees.{export_format}"
+    return StreamingResponse(
+        iter_export(export_format, columns, rows),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=PaginatedAPIResponse)
+@query_budget(1)
+async def get_check_in_job_route(
+    job_id: str,
+    limit: int = Query(
+        config.PAGINATION_DEFAULT_LIMIT, ge=1, le=config.PAGINATION_MAX_LIMIT
+    ),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Status and counters of a bulk check-in job, with a page of its results."""
+    redis = get_redis()
+    store = CheckInJobStore(redis) if redis is not None else None
+    job = await store.get(job_id) if store else None
+    if not job or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Check-in job not found")
+
+    after = decode_cursor(cursor)
+    try:
+        offset = int(after["offset"]) if after else 0
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    results = await store.get_results(job_id, offset, limit + 1)
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = encode_cursor({"offset": offset + limit})
+    return PaginatedAPIResponse(
+        message="Check-in job fetched successfully",
+        data={**job, "results": results},
+        next_cursor=next_cursor,
     )
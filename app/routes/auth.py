@@ -6,6 +6,8 @@ from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
+from app.core.query_budget import query_budget
+from app.core.rate_limit import limit_by_ip, limit_by_login
 from app.core.security import create_access_token
 from app.core.settings import config
 from app.repositories.user_repo import UserRepository, get_user_repo
@@ -17,7 +19,13 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-@router.post("/register", response_model=APIResponse, status_code=201)
+@router.post(
+    "/register",
+    response_model=APIResponse,
+    status_code=201,
+    dependencies=[Depends(limit_by_ip("signup", config.RATE_LIMIT_SIGNUP_PER_IP))],
+)
+@query_budget(2)
 async def register(
     user_data: UserCreate,
     user_repo: UserRepository = Depends(get_user_repo),
@@ -30,7 +38,16 @@ async def register(
     )
 
 
-@router.post("/login", response_model=APIResponse, status_code=200)
+@router.post(
+    "/login",
+    response_model=APIResponse,
+    status_code=200,
+    dependencies=[
+        Depends(limit_by_ip("login", config.RATE_LIMIT_LOGIN_PER_IP)),
+        Depends(limit_by_login("login", config.RATE_LIMIT_LOGIN_PER_ACCOUNT)),
+    ],
+)
+@query_budget(2)
 async def login(
     user_data: UserLogin,
     user_repo: UserRepository = Depends(get_user_repo),
@@ -71,6 +88,7 @@ async def login(
 
 
 @router.post("/logout/")
+@query_budget(2)
 async def logout(
     token: str = Depends(oauth2_scheme),
     user_repo: UserRepository = Depends(get_user_repo),
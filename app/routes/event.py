@@ -1,24 +1,38 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependency import get_current_user
-from app.models.user import User
+from app.core.query_budget import query_budget
+from app.core.settings import config
+from app.core.user_cache import UserPrincipal
 from app.repositories.event_repo import EventRepository, get_event_repo
-from app.schemas.event import EventCreate, EventResponse, EventStatus, EventUpdate
-from app.utils.response_format import APIResponse
+from app.schemas.event import (
+    EventCreate,
+    EventResponse,
+    EventStatus,
+    EventUpdate,
+    serialize_event_row,
+)
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.response_format import (
+    APIResponse,
+    PaginatedAPIResponse,
+    paginated_response,
+)
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
 
 @router.post("/", response_model=APIResponse, status_code=201)
+@query_budget(3)
 async def create_event_route(
     event: EventCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     event_repo: EventRepository = Depends(get_event_repo),
 ):
     new_evt = await event_repo.create_event(event)
@@ -28,32 +42,78 @@ async def create_event_route(
     )
 
 
-@router.get("/", response_model=APIResponse, status_code=200)
+@router.get("/", response_model=PaginatedAPIResponse, status_code=200)
+@query_budget(3)
 async def list_events_route(
     status: Optional[EventStatus] = None,
     location: Optional[str] = None,
     date: Optional[datetime] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(
+        config.PAGINATION_DEFAULT_LIMIT, ge=1, le=config.PAGINATION_MAX_LIMIT
+    ),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     event_repo: EventRepository = Depends(get_event_repo),
 ):
-    events = await event_repo.list_events(status, location, date)
-    return APIResponse(
-        message="Events fetched successfully",
-        data=[EventResponse.serialize(event) for event in events],
+    fingerprint = await event_repo.list_events_fingerprint(status, location, date, q)
+    etag = make_etag("events", status, location, date, q, limit, cursor, *fingerprint)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    events, next_cursor = await event_repo.list_events(
+        status, location, date, limit, cursor, q
+    )
+    return paginated_response(
+        "Events fetched successfully",
+        [serialize_event_row(event) for event in events],
+        next_cursor,
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/search", response_model=PaginatedAPIResponse, status_code=200)
+@query_budget(2)
+async def search_events_route(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(
+        config.PAGINATION_DEFAULT_LIMIT, ge=1, le=config.PAGINATION_MAX_LIMIT
+    ),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_user),
+    event_repo: EventRepository = Depends(get_event_repo),
+):
+    events, next_cursor = await event_repo.search_events(q, limit, cursor)
+    return paginated_response(
+        "Events fetched successfully",
+        [serialize_event_row(event) for event in events],
+        next_cursor,
     )
 
 
 @router.get("/{event_id}", response_model=APIResponse, status_code=200)
+@query_budget(2)
 async def get_event_route(
     event_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     event_repo: EventRepository = Depends(get_event_repo),
 ):
-    event = await event_repo.get_event(event_id)
+    event = await event_repo.get_event_snapshot(event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
+
+    etag = make_etag(
+        "event", event.id, event.updated_at.isoformat(), event.current_status.value
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
     return APIResponse(
         message="Event fetched successfully",
         data=EventResponse.serialize(event),
@@ -61,11 +121,12 @@ async def get_event_route(
 
 
 @router.put("/{event_id}", response_model=APIResponse, status_code=200)
+@query_budget(3)
 async def update_event_route(
     event_id: int,
     event_update_data: EventUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     event_repo: EventRepository = Depends(get_event_repo),
 ):
     updated_evt = await event_repo.update_event(event_id, event_update_data)
@@ -78,10 +139,11 @@ async def update_event_route(
 
 
 @router.delete("/{event_id}", response_model=APIResponse, status_code=200)
+@query_budget(4)
 async def delete_event_route(
     event_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     event_repo: EventRepository = Depends(get_event_repo),
 ):
     deleted_evt = await event_repo.delete_event(event_id)
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Depends
 
+from app.core.event_cache import event_cache
+from app.core.query_budget import query_budget
+from app.core.user_cache import user_cache
 from app.repositories.event_repo import EventRepository, get_event_repo
 from app.utils.response_format import APIResponse
 
@@ -7,8 +10,23 @@ router = APIRouter(prefix="/internal", tags=["Internal"])
 
 
 @router.get("/event-checker", response_model=APIResponse, status_code=200)
+@query_budget(2)
 async def event_checker_route(
     event_repo: EventRepository = Depends(get_event_repo),
 ):
-    await event_repo.check_events_status()
-    return APIResponse(message="Updated events status")
+    transitioned = await event_repo.check_events_status()
+    return APIResponse(
+        message="Updated events status",
+        data={status: len(ids) for status, ids in transitioned.items()},
+    )
+
+
+@router.get("/cache-stats", response_model=APIResponse, status_code=200)
+async def cache_stats_route():
+    return APIResponse(
+        message="Cache statistics",
+        data={
+            "user_cache": user_cache.stats_dict(),
+            "event_cache": event_cache.stats_dict(),
+        },
+    )
@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from typing import List
+
+from pydantic import BaseModel, EmailStr, model_validator
+
+from app.core.settings import config
 
 
 class AttendeeResponse(BaseModel):
@@ -8,3 +12,29 @@ class AttendeeResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class AttendeeBatchRegister(BaseModel):
+    """Users to register for one event, by id, by email, or both."""
+
+    user_ids: List[int] = []
+    emails: List[EmailStr] = []
+    # Register nobody unless every listed user can be registered.
+    all_or_nothing: bool = False
+
+    @model_validator(mode="after")
+    def validate_size(self):
+        total = len(self.user_ids) + len(self.emails)
+        if not total:
+            raise ValueError("Provide at least one user id or email")
+        if total > config.BATCH_REGISTER_MAX_USERS:
+            raise ValueError(
+                f"At most {config.BATCH_REGISTER_MAX_USERS} users per batch"
+            )
+        return self
+
+    def lists_only(self, user) -> bool:
+        """Whether `user` is the only user the batch names."""
+        return all(user_id == user.id for user_id in self.user_ids) and all(
+            email == user.email for email in self.emails
+        )
@@ -128,5 +128,34 @@ class EventResponse(DateTimeBase):
             end_time=event.end_time.time(),
             location=event.location,
             max_attendees=event.max_attendees,
-            status=event.status,
+            status=event.current_status,
         )
+
+
+def _format_date(value: datetime) -> str:
+    return f"{value.day:02d}/{value.month:02d}/{value.year:04d}"
+
+
+def _format_time(value: datetime) -> str:
+    hour = value.hour % 12 or 12
+    meridiem = "AM" if value.hour < 12 else "PM"
+    return f"{hour:02d}:{value.minute:02d} {meridiem}"
+
+
+def serialize_event_row(row) -> dict:
+    """
+    Same output as EventResponse.serialize(...).model_dump(mode="json"), built
+    from a column-level row (see event_list_columns) without running any
+    validators. Used by the high-volume listing endpoints.
+    """
+    return {
+        "event_id": row.id,
+        "name": row.name,
+        "description": row.description,
+        "date": _format_date(row.start_time),
+        "start_time": _format_time(row.start_time),
+        "end_time": _format_time(row.end_time),
+        "location": row.location,
+        "max_attendees": row.max_attendees,
+        "status": row.status.value,
+    }
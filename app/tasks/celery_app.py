@@ -1,10 +1,12 @@
 from celery import Celery
 from celery.schedules import crontab
 
+from app.core.settings import config
+
 celery_app = Celery(
     "celery_worker",
-    broker="redis://event_management_redis:6379/0",
-    backend="redis://event_management_redis:6379/0",
+    broker=config.REDIS_URL,
+    backend=config.REDIS_URL,
 )
 
 
@@ -12,12 +14,15 @@ celery_app.conf.update(
     result_expires=3600,
     worker_prefetch_multiplier=1,
     task_track_started=True,
+    task_always_eager=config.CELERY_TASK_ALWAYS_EAGER,
 )
 
+# Transitions are scheduled at their due time by advance_event_statuses
+# itself; beat only (re)starts that chain in case it was lost.
 celery_app.conf.beat_schedule = {
-    "update_appointments_every_minute": {
-        "task": "app.tasks.tasks.check_events_status",
-        "schedule": crontab(minute="*/1"),
+    "advance_event_statuses_safety_net": {
+        "task": "app.tasks.tasks.advance_event_statuses",
+        "schedule": crontab(minute=f"*/{config.EVENT_STATUS_SAFETY_NET_MINUTES}"),
     },
 }
 
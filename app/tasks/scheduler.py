@@ -0,0 +1,34 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.repositories.event_repo import due_status_transitions, next_transition_queries
+
+
+def run_due_transitions(db: Session, now: datetime) -> Dict[str, List[int]]:
+    """Apply every status transition due at `now` and commit them together."""
+    transitioned = {}
+    for new_status, query in due_status_transitions(now).items():
+        transitioned[new_status.value] = db.execute(query).scalars().all()
+    db.commit()
+    return transitioned
+
+
+def next_transition_at(db: Session) -> Optional[datetime]:
+    """Earliest start_time/end_time at which a pending transition becomes due."""
+    candidates = [db.execute(query).scalar() for query in next_transition_queries()]
+    candidates = [candidate for candidate in candidates if candidate is not None]
+    return min(candidates) if candidates else None
+
+
+def next_run_delay(next_at: Optional[datetime], now: datetime, max_sleep: int) -> int:
+    """Seconds until the next run: the next transition, capped by `max_sleep`."""
+    if next_at is None:
+        return max_sleep
+    return max(1, min(max_sleep, int((next_at - now).total_seconds()) + 1))
+
+
+def elapsed_ms(started: float) -> float:
+    return round((time.monotonic() - started) * 1000, 2)
@@ -1,26 +1,160 @@
-import requests
+import asyncio
+import io
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import uuid4
+
+from celery.signals import worker_ready
 from celery.utils.log import get_task_logger
+from fastapi import HTTPException, UploadFile
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 
+from app.core.checkin_jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_RUNNING,
+    CheckInJobStore,
+)
+from app.core.database import SessionLocal, create_task_sessionmaker
+from app.core.event_cache import event_version_key
+from app.core.settings import config
+from app.repositories.attendee_repo import AttendeeRepository
 from app.tasks.celery_app import celery_app
+from app.tasks.scheduler import (
+    elapsed_ms,
+    next_run_delay,
+    next_transition_at,
+    run_due_transitions,
+)
+from app.utils.file_readers import iter_email_batches
 
 logger = get_task_logger(__name__)
 
+# Token of the single live self-scheduling chain; older chains see a
+# different token and stop.
+NEXT_RUN_KEY = "event_status:next_run"
+NEXT_RUN_GRACE_SECONDS = 60
+
+
+def get_scheduler_redis() -> Redis:
+    return Redis.from_url(config.REDIS_URL, decode_responses=True)
+
 
-@celery_app.task(name="app.tasks.tasks.check_events_status")
-def check_events_status():
+def get_job_redis() -> AsyncRedis:
+    return AsyncRedis.from_url(config.REDIS_URL)
+
+
+@celery_app.task(name="app.tasks.tasks.advance_event_statuses")
+def advance_event_statuses(token: Optional[str] = None):
     """
-    Periodically check for events where end_time < now, and
-    mark them as 'completed' if they're not already.
+    Fire the event status transitions that are due (scheduled -> ongoing at
+    start_time, ongoing -> completed at end_time), then schedule the next run
+    for the earliest pending transition time. Beat calls this without a token
+    as a safety net; every call starts a new chain and supersedes the old one.
     """
+    redis = get_scheduler_redis()
+    if token is not None and redis.get(NEXT_RUN_KEY) != token:
+        logger.info("Superseded event status run skipped")
+        return {"skipped": True}
+
+    started = time.monotonic()
+    now = datetime.now()
+    with SessionLocal() as db:
+        transitioned = run_due_transitions(db, now)
+        next_at = next_transition_at(db)
+
+    if config.EVENT_CACHE_BACKEND == "redis":
+        # Bump the shared cache version of every transitioned event.
+        pipeline = redis.pipeline()
+        for event_ids in transitioned.values():
+            for event_id in event_ids:
+                pipeline.incr(event_version_key(event_id))
+        pipeline.execute()
+
+    delay = next_run_delay(next_at, now, config.EVENT_STATUS_MAX_SLEEP_SECONDS)
+    next_token = uuid4().hex
+    redis.set(NEXT_RUN_KEY, next_token, ex=delay + NEXT_RUN_GRACE_SECONDS)
+    advance_event_statuses.apply_async(kwargs={"token": next_token}, countdown=delay)
+
+    metrics = {
+        "transitioned": {status: len(ids) for status, ids in transitioned.items()},
+        "duration_ms": elapsed_ms(started),
+        "next_transition_at": next_at.isoformat() if next_at else None,
+        "next_run_at": (now + timedelta(seconds=delay)).isoformat(),
+    }
+    logger.info("Event status run: %s", metrics)
+    return metrics
+
+
+@worker_ready.connect
+def start_event_status_chain(sender=None, **kwargs):
+    """Start the transition chain on boot instead of waiting for beat."""
+    advance_event_statuses.delay()
+
+
+@celery_app.task(name="app.tasks.tasks.process_bulk_check_in")
+def process_bulk_check_in(job_id: str):
+    """
+    Check in the emails of a stored bulk check-in upload, committing and
+    recording progress one BULK_CHECKIN_CHUNK_SIZE batch at a time.
+    """
+    return asyncio.run(_process_bulk_check_in(job_id))
+
+
+def _email_batches(filename: str, content: bytes):
+    upload = UploadFile(io.BytesIO(content), filename=filename)
+    return iter_email_batches(
+        upload, config.BULK_CHECKIN_CHUNK_SIZE, config.BULK_CHECKIN_MAX_ROWS
+    )
+
+
+async def _process_bulk_check_in(job_id: str):
+    redis = get_job_redis()
+    store = CheckInJobStore(redis)
+    task_engine, TaskSession = create_task_sessionmaker()
     try:
-        response = requests.get(
-            "http://event_management_app:8100/api/internal/event-checker"
-        )
-        if response.status_code != 200:
-            logger.error(
-                f"Failed to check events status: {response.status_code} - {response.text}"
-            )
+        job = await store.get(job_id)
+        content = await store.claim_upload(job_id) if job else None
+        if content is None:
+            logger.info("Check-in job %s is gone or already claimed", job_id)
+            return {"skipped": True}
+
+        started = time.monotonic()
+        await store.set_status(job_id, JOB_RUNNING)
+        try:
+            # Read the file once without touching the database, so a malformed
+            # or oversized upload is refused before anything is checked in.
+            async for _ in _email_batches(job["filename"], content):
+                pass
+
+            async with TaskSession() as db:
+                chunks = AttendeeRepository(db).bulk_check_in_chunks(
+                    job["event_id"], _email_batches(job["filename"], content)
+                )
+                async for result in chunks:
+                    await store.record_chunk(job_id, result)
+        except HTTPException as exc:
+            await store.set_status(job_id, JOB_FAILED, exc.detail)
+        except Exception:
+            logger.exception("Check-in job %s failed", job_id)
+            await store.set_status(job_id, JOB_FAILED, "Check-in job failed")
+            raise
         else:
-            logger.info("Event checker task completed successfully!")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request failed: {str(e)}")
+            await store.set_status(job_id, JOB_COMPLETED)
+
+        job = await store.get(job_id)
+        logger.info(
+            "Check-in job %s %s in %sms: %s processed, %s succeeded, %s failed",
+            job_id,
+            job["status"],
+            elapsed_ms(started),
+            job["processed"],
+            job["succeeded"],
+            job["failed"],
+        )
+        return job
+    finally:
+        await task_engine.dispose()
+        await redis.aclose()
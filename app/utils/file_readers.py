@@ -0,0 +1,145 @@
+import csv
+import io
+from typing import AsyncIterator, BinaryIO, Iterator, List, Optional
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import iterate_in_threadpool
+
+READ_CHUNK_SIZE = 64 * 1024
+EMAIL_COLUMN = "email"
+
+
+def _email_column_index(header) -> int:
+    for index, name in enumerate(header):
+        if name is not None and str(name).strip().lower() == EMAIL_COLUMN:
+            return index
+    raise HTTPException(
+        status_code=400, detail=f"File must contain an '{EMAIL_COLUMN}' column"
+    )
+
+
+def _cell_email(row, index: int) -> Optional[str]:
+    if index >= len(row) or row[index] is None:
+        return None
+    return str(row[index]).strip() or None
+
+
+def _iter_csv_emails(fileobj: BinaryIO, batch_size: int) -> Iterator[List[str]]:
+    # One reader over the whole decoded stream, so a quoted field spanning
+    # several lines is parsed as one field wherever the file is read in chunks.
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        rows = csv.reader(text)
+        email_index = None
+        emails = []
+        for row in rows:
+            if not row:
+                continue
+            if email_index is None:
+                email_index = _email_column_index(row)
+                continue
+            email = _cell_email(row, email_index)
+            if email:
+                emails.append(email)
+            if len(emails) >= batch_size:
+                yield emails
+                emails = []
+        if email_index is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File must contain an '{EMAIL_COLUMN}' column",
+            )
+        if emails:
+            yield emails
+    except csv.Error:
+        raise HTTPException(status_code=400, detail="Could not read CSV file")
+    finally:
+        # Leave the upload open; it belongs to the caller.
+        text.detach()
+
+
+def _iter_xlsx_emails(fileobj: BinaryIO, batch_size: int) -> Iterator[List[str]]:
+    # Imported lazily so openpyxl is only loaded when an Excel file arrives.
+    from openpyxl import load_workbook
+
+    fileobj.seek(0)
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Could not read Excel file")
+
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File must contain an '{EMAIL_COLUMN}' column",
+            )
+        email_index = _email_column_index(header)
+
+        emails = []
+        for row in rows:
+            email = _cell_email(row, email_index)
+            if email:
+                emails.append(email)
+            if len(emails) >= batch_size:
+                yield emails
+                emails = []
+        if emails:
+            yield emails
+    finally:
+        workbook.close()
+
+
+def check_upload_type(filename: Optional[str]) -> None:
+    if not (filename or "").lower().endswith((".csv", ".xlsx")):
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file type, Only CSV and Excel (.xlsx) are supported",
+        )
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """The whole upload, or 413 once it grows past `max_bytes`."""
+    content = bytearray()
+    while chunk := await file.read(READ_CHUNK_SIZE):
+        content.extend(chunk)
+        if len(content) > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File exceeds the maximum of {max_bytes} bytes",
+            )
+    return bytes(content)
+
+
+async def iter_email_batches(
+    file: UploadFile, batch_size: int, max_rows: int
+) -> AsyncIterator[List[str]]:
+    """
+    Stream the `email` column of an uploaded CSV or Excel (.xlsx) file as
+    batches of at most `batch_size` emails, holding at most one batch in memory.
+    Raises 413 once more than `max_rows` emails have been read.
+    """
+    check_upload_type(file.filename)
+    if file.filename.lower().endswith(".csv"):
+        reader = _iter_csv_emails
+    else:
+        reader = _iter_xlsx_emails
+    chunks = iterate_in_threadpool(reader(file.file, batch_size))
+
+    total = 0
+    batch = []
+    async for emails in chunks:
+        total += len(emails)
+        if total > max_rows:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File exceeds the maximum of {max_rows} rows",
+            )
+        batch.extend(emails)
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+    if batch:
+        yield batch
@@ -0,0 +1,96 @@
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, List, Sequence
+
+import orjson
+from starlette.concurrency import run_in_threadpool
+
+XLSX_READ_CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 1024 * 1024
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _cell_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _iter_csv(
+    columns: Sequence[str], batches: AsyncIterable[List]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        writer.writerows([_cell_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def _iter_ndjson(
+    columns: Sequence[str], batches: AsyncIterable[List]
+) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def _append_rows(sheet, rows: List) -> None:
+    for row in rows:
+        sheet.append(list(row))
+
+
+def _save_workbook(workbook):
+    # Write-only worksheets keep their rows in temporary files, and the zip is
+    # spooled to disk once it outgrows SPOOL_MAX_SIZE.
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+async def _iter_xlsx(
+    columns: Sequence[str], batches: AsyncIterable[List]
+) -> AsyncIterator[bytes]:
+    # Imported lazily so openpyxl is only loaded when an Excel export is asked for.
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(columns))
+    async for rows in batches:
+        await run_in_threadpool(_append_rows, sheet, rows)
+
+    output = await run_in_threadpool(_save_workbook, workbook)
+    try:
+        while True:
+            chunk = await run_in_threadpool(output.read, XLSX_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        output.close()
+
+
+def iter_export(
+    export_format: str, columns: Sequence[str], batches: AsyncIterable[List]
+) -> AsyncIterator[bytes]:
+    """
+    Encode batches of row tuples as `export_format` (a key of
+    EXPORT_MEDIA_TYPES), holding at most one batch in memory. CSV and NDJSON
+    are written as the batches arrive; XLSX is assembled on disk and streamed
+    once the last batch is in, since the zip container cannot be emitted
+    incrementally.
+    """
+    writers = {"csv": _iter_csv, "ndjson": _iter_ndjson, "xlsx": _iter_xlsx}
+    return writers[export_format](columns, batches)
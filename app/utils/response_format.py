@@ -1,8 +1,36 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+import orjson
 from pydantic import BaseModel
+from starlette.responses import JSONResponse
 
 
 class APIResponse(BaseModel):
     message: str = ""
     data: Dict[str, Any] | list[Dict[str, Any]] | Any = {}
+
+
+class PaginatedAPIResponse(APIResponse):
+    next_cursor: Optional[str] = None
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def paginated_response(
+    message: str,
+    data: List[Dict[str, Any]],
+    next_cursor: Optional[str],
+    headers: Optional[Dict[str, str]] = None,
+) -> ORJSONResponse:
+    """
+    PaginatedAPIResponse envelope rendered straight to JSON bytes. Returning a
+    Response skips FastAPI's response_model validation, so `data` must already
+    hold plain, serializer-ready dicts.
+    """
+    return ORJSONResponse(
+        content={"message": message, "data": data, "next_cursor": next_cursor},
+        headers=headers,
+    )
@@ -0,0 +1,393 @@
+"""
+Throughput and latency percentiles of the API's hot paths, driving the real
+app in-process through httpx's ASGI transport against a freshly seeded
+database. Results are printed as JSON so runs can be diffed.
+
+    python -m benchmarks.load --users 2000 --events 20 --attendees 500 \
+        --requests 500 --concurrency 10 --output results.json
+
+Without --database-url the run uses a throwaway SQLite file. Pass a local
+Postgres URL to benchmark that instead; its tables are dropped and recreated.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+SCENARIOS = (
+    "login",
+    "list_events",
+    "register_attendee",
+    "register_batch",
+    "check_in_attendee",
+    "bulk_check_in",
+    "list_attendees",
+)
+PASSWORD = "benchmark-password"
+SEED_BATCH_SIZE = 5000
+
+
+def configure_environment(database_url: str) -> None:
+    """Point the app at the benchmark database before any app module loads."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["DATABASE_REPLICA_URLS"] = ""
+    # Every request comes from one client; measure the endpoints, not the limiter.
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    # register_batch registers other users on behalf of bench0.
+    os.environ["ADMIN_EMAILS"] = email(0)
+
+
+def email(index: int) -> str:
+    return f"bench{index}@example.com"
+
+
+def seed(users: int, events: int, attendees: int) -> None:
+    """
+    Users bench0..benchN share one password. Users 0..attendees-1 are
+    registered for every event; the rest are left for register_attendee and
+    register_batch.
+    """
+    from sqlalchemy import insert
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.security import get_password_hash
+    from app.models.attendee import Attendee
+    from app.models.event import Event
+    from app.models.user import User
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    now = datetime.now(timezone.utc)
+    start = datetime.now() + timedelta(days=1)
+    password = get_password_hash(PASSWORD)
+
+    def batched(rows):
+        for offset in range(0, len(rows), SEED_BATCH_SIZE):
+            yield rows[offset : offset + SEED_BATCH_SIZE]
+
+    with SessionLocal() as session:
+        user_rows = [
+            {
+                "username": f"bench{i}",
+                "email": email(i),
+                "first_name": "Bench",
+                "last_name": f"User {i}",
+                "phone_number": "0000000000",
+                "password": password,
+                "token_version": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(users)
+        ]
+        for batch in batched(user_rows):
+            session.execute(insert(User), batch)
+
+        event_rows = [
+            {
+                "name": f"Benchmark event {i}",
+                "description": "Synthetic benchmark event",
+                "start_time": start + timedelta(hours=i),
+                "end_time": start + timedelta(hours=i, minutes=90),
+                "location": f"Hall {i % 10}",
+                "max_attendees": users,
+                "registered_count": attendees,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(events)
+        ]
+        event_ids = session.scalars(insert(Event).returning(Event.id), event_rows).all()
+
+        attendee_rows = [
+            {
+                "user_id": user_id,
+                "event_id": event_id,
+                "check_in_status": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for event_id in event_ids
+            for user_id in range(1, attendees + 1)
+        ]
+        for batch in batched(attendee_rows):
+            session.execute(insert(Attendee), batch)
+        session.commit()
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, round(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def run_scenario(client, send, warmup: int, requests: int, concurrency: int):
+    """
+    Call `send(client, i)` for i in range(warmup + requests) from `concurrency`
+    workers; the first `warmup` calls are not measured.
+    """
+    for i in range(warmup):
+        await send(client, i)
+
+    pending = iter(range(warmup, warmup + requests))
+    latencies, errors = [], {}
+
+    async def worker():
+        for i in pending:
+            started = time.perf_counter()
+            response = await send(client, i)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": {str(code): count for code, count in sorted(errors.items())},
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(requests / elapsed, 2),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3),
+        },
+    }
+
+
+def build_scenarios(args) -> dict:
+    """Request factories per scenario, spread over the seeded users and events."""
+    from app.core.security import create_access_token
+
+    token_cache = {}
+
+    def auth(user: int) -> dict:
+        if user not in token_cache:
+            token_cache[user] = create_access_token(
+                data={"sub": email(user), "version": 0}
+            )
+        return {"Authorization": f"Bearer {token_cache[user]}"}
+
+    def event_id(i: int) -> int:
+        return i % args.events + 1
+
+    def attendee(i: int) -> int:
+        return i % args.attendees
+
+    # Unregistered users: register_attendee takes one per (event, call),
+    # register_batch the next --batch-size per (event, call) after those.
+    per_event = -(-(args.warmup + args.requests) // args.events)
+    first_batch_user = args.attendees + per_event
+
+    def bulk_file(i: int) -> bytes:
+        rows = min(args.bulk_rows, args.attendees)
+        first = i * rows % args.attendees
+        emails = [email((first + j) % args.attendees) for j in range(rows)]
+        return ("email\n" + "\n".join(emails) + "\n").encode()
+
+    async def login(client, i):
+        return await client.post(
+            "/api/auth/login",
+            json={"username": f"bench{i % args.users}", "password": PASSWORD},
+        )
+
+    async def list_events(client, i):
+        return await client.get(
+            "/api/events/", params={"limit": args.page_size}, headers=auth(attendee(i))
+        )
+
+    async def register_attendee(client, i):
+        # Walk the (event, unregistered user) pairs so every call is new.
+        user = args.attendees + i // args.events
+        return await client.post(
+            f"/api/attendees/{event_id(i)}/register", headers=auth(user)
+        )
+
+    async def register_batch(client, i):
+        first = first_batch_user + i // args.events * args.batch_size
+        # Seeded user bench<n> has id n + 1.
+        user_ids = list(range(first + 1, first + args.batch_size + 1))
+        return await client.post(
+            f"/api/attendees/{event_id(i)}/register_batch",
+            headers=auth(0),
+            json={"user_ids": user_ids},
+        )
+
+    async def check_in_attendee(client, i):
+        return await client.post(
+            f"/api/attendees/{event_id(i)}/checkin", headers=auth(attendee(i))
+        )
+
+    async def bulk_check_in(client, i):
+        return await client.post(
+            f"/api/attendees/{event_id(i)}/checkin_bulk",
+            headers=auth(0),
+            files={"file": ("attendees.csv", bulk_file(i), "text/csv")},
+        )
+
+    async def list_attendees(client, i):
+        return await client.get(
+            f"/api/attendees/{event_id(i)}/list",
+            params={"limit": args.page_size},
+            headers=auth(attendee(i)),
+        )
+
+    return {
+        "login": login,
+        "list_events": list_events,
+        "register_attendee": register_attendee,
+        "register_batch": register_batch,
+        "check_in_attendee": check_in_attendee,
+        "bulk_check_in": bulk_check_in,
+        "list_attendees": list_attendees,
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+
+    from app.main import app
+
+    senders = build_scenarios(args)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+        for name in args.scenarios:
+            results[name] = await run_scenario(
+                client, senders[name], args.warmup, args.requests, args.concurrency
+            )
+            if name == "register_batch":
+                results[name]["rows_per_second"] = round(
+                    results[name]["requests_per_second"] * args.batch_size, 2
+                )
+            print(format_result(name, results[name]), file=sys.stderr)
+    return results
+
+
+def format_result(name: str, result: dict) -> str:
+    latency = result["latency_ms"]
+    errors = sum(result["errors"].values())
+    return (
+        f"{name:<18} {result['requests_per_second']:>9.1f} req/s  "
+        f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+        f"p99 {latency['p99']:>8.2f} ms  errors {errors}"
+    )
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="sync URL; default: a temp SQLite file")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--attendees", type=int, default=500, help="per event")
+    parser.add_argument("--requests", type=int, default=500, help="per scenario")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--bulk-rows", type=int, default=200, help="emails per file")
+    parser.add_argument("--batch-size", type=int, default=100, help="users per batch")
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=SCENARIOS,
+        default=list(SCENARIOS),
+        metavar="SCENARIO",
+        help=f"subset of: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    if min(args.events, args.attendees, args.requests, args.concurrency) < 1:
+        parser.error("--events, --attendees, --requests and --concurrency must be >= 1")
+    if args.attendees > args.users:
+        parser.error("--attendees cannot exceed --users")
+    per_event = -(-(args.warmup + args.requests) // args.events)
+    needed = args.attendees + per_event
+    if "register_batch" in args.scenarios:
+        needed += per_event * args.batch_size
+    if needed > args.users and {"register_attendee", "register_batch"} & set(
+        args.scenarios
+    ):
+        parser.error(
+            f"registration scenarios need {needed} users; raise --users, "
+            "--events or lower --attendees, --requests, --batch-size"
+        )
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = args.database_url or f"sqlite:///{scratch}/benchmark.db"
+        configure_environment(database_url)
+
+        started = time.perf_counter()
+        seed(args.users, args.events, args.attendees)
+        seed_seconds = time.perf_counter() - started
+        print(f"seeded in {seed_seconds:.1f}s", file=sys.stderr)
+
+        results = asyncio.run(run(args))
+
+        from app.core.database import async_engine, engine
+
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "database": database_url.split(":", 1)[0],
+        "scale": {
+            "users": args.users,
+            "events": args.events,
+            "attendees_per_event": args.attendees,
+            "seed_seconds": round(seed_seconds, 2),
+        },
+        "settings": {
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "page_size": args.page_size,
+            "bulk_rows": args.bulk_rows,
+            "batch_size": args.batch_size,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Rows/sec of the event listing response path, before and after the fast
+serializer: ORM entities + EventResponse + APIResponse validation +
+jsonable_encoder versus column rows + serialize_event_row + orjson.
+
+    python -m benchmarks.serialization --rows 200 --repeat 50
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import attendee, user  # noqa: E402, F401
+from app.models.event import Event  # noqa: E402
+from app.repositories.event_repo import event_list_columns  # noqa: E402
+from app.schemas.event import EventResponse, serialize_event_row  # noqa: E402
+from app.utils.response_format import (  # noqa: E402
+    APIResponse,
+    ORJSONResponse,
+    PaginatedAPIResponse,
+)
+
+
+def seed(session: Session, rows: int) -> None:
+    start = datetime.now() + timedelta(days=1)
+    session.execute(
+        insert(Event),
+        [
+            {
+                "name": f"Event {i}",
+                "description": "Synthetic benchmark event",
+                "start_time": start + timedelta(minutes=i),
+                "end_time": start + timedelta(minutes=i, hours=2),
+                "location": f"Hall {i % 10}",
+                "max_attendees": 100,
+                "created_at": start,
+                "updated_at": start,
+            }
+            for i in range(rows)
+        ],
+    )
+    session.commit()
+
+
+def orm_path(session: Session, rows: int) -> bytes:
+    events = session.execute(select(Event).limit(rows)).scalars().all()
+    payload = APIResponse(
+        message="Events fetched successfully",
+        data=[EventResponse.serialize(event) for event in events],
+    )
+    # FastAPI re-validates the returned model against response_model.
+    validated = PaginatedAPIResponse.model_validate(payload.model_dump())
+    body = JSONResponse(jsonable_encoder(validated)).body
+    session.expunge_all()
+    return body
+
+
+def fast_path(session: Session, rows: int) -> bytes:
+    events = session.execute(select(*event_list_columns()).limit(rows)).all()
+    return ORJSONResponse(
+        {
+            "message": "Events fetched successfully",
+            "data": [serialize_event_row(event) for event in events],
+            "next_cursor": None,
+        }
+    ).body
+
+
+def measure(path, session: Session, rows: int, repeat: int) -> float:
+    path(session, rows)  # warm up statement caches
+    started = time.perf_counter()
+    for _ in range(repeat):
+        path(session, rows)
+    return rows * repeat / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.rows)
+        before = measure(orm_path, session, args.rows, args.repeat)
+        after = measure(fast_path, session, args.rows, args.repeat)
+
+    print(f"rows per response: {args.rows}, responses: {args.repeat}")
+    print(f"orm + pydantic : {before:>10.0f} rows/sec")
+    print(f"columns + orjson: {after:>10.0f} rows/sec ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
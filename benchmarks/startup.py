@@ -0,0 +1,201 @@
+"""
+Cold-start cost of the API: importing app.main in a fresh interpreter,
+booting gunicorn until every worker serves requests, and respawning a
+killed worker. Results are printed as JSON, like benchmarks.load.
+
+    python -m benchmarks.startup --workers 4 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import platform
+import queue
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+from benchmarks.load import git_commit
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+READY = re.compile(r"\[(\d+)\] \[INFO\] Application startup complete")
+
+
+def summary(samples: list) -> dict:
+    return {
+        "runs": len(samples),
+        "min_ms": round(min(samples) * 1000, 1),
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def measure_import(env: dict, repeat: int) -> dict:
+    """Import time of app.main, and wall time of the whole interpreter run."""
+    imports, processes = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", IMPORT_SNIPPET],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        processes.append(time.perf_counter() - started)
+        imports.append(float(result.stdout.strip().splitlines()[-1]))
+    return {"import_app": summary(imports), "interpreter": summary(processes)}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """A gunicorn master whose log lines are collected with arrival times."""
+
+    def __init__(self, env: dict, workers: int):
+        self.port = free_port()
+        self.lines = queue.Queue()
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "-c",
+                "gunicorn.conf.py",
+                "--bind",
+                f"127.0.0.1:{self.port}",
+                "app.main:app",
+            ],
+            env=dict(env, WEB_CONCURRENCY=str(workers)),
+            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            text=True,
+        )
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stderr:
+            self.lines.put((time.perf_counter(), line))
+
+    def wait_for(self, pattern, count: int, timeout: float) -> list:
+        """Arrival time and pid of the next `count` lines matching `pattern`."""
+        deadline = time.perf_counter() + timeout
+        matches = []
+        while len(matches) < count:
+            try:
+                at, line = self.lines.get(
+                    timeout=max(0, deadline - time.perf_counter())
+                )
+            except queue.Empty:
+                raise TimeoutError(f"gave up waiting for {pattern.pattern!r}")
+            match = pattern.search(line)
+            if match:
+                matches.append((at, int(match.group(1))))
+        return matches
+
+    def get_health(self, timeout: float) -> float:
+        """Time at which /health first answered 200."""
+        url = f"http://127.0.0.1:{self.port}/health"
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter()
+            except OSError:
+                time.sleep(0.005)
+        raise TimeoutError("/health never answered")
+
+    def stop(self):
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def measure_server(env: dict, workers: int, repeat: int, timeout: float) -> dict:
+    first_response, all_ready, respawn = [], [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        server = Server(env, workers)
+        try:
+            first_response.append(server.get_health(timeout) - started)
+            ready = server.wait_for(READY, workers, timeout)
+            all_ready.append(max(at for at, _ in ready) - started)
+
+            victim = ready[0][1]
+            killed = time.perf_counter()
+            os.kill(victim, signal.SIGKILL)
+            replaced = server.wait_for(READY, 1, timeout)
+            respawn.append(replaced[0][0] - killed)
+        finally:
+            server.stop()
+    return {
+        "first_response": summary(first_response),
+        "all_workers_ready": summary(all_ready),
+        "worker_respawn": summary(respawn),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument(
+        "--skip-server", action="store_true", help="only measure the import"
+    )
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{scratch}/startup.db",
+            DATABASE_REPLICA_URLS="",
+        )
+        env.pop("ASYNC_DATABASE_URL", None)
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+        results = measure_import(env, args.repeat)
+        if not args.skip_server:
+            results.update(measure_server(env, args.workers, args.repeat, args.timeout))
+
+    for name, result in results.items():
+        print(f"{name:<18} median {result['median_ms']:>8.1f} ms", file=sys.stderr)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "workers": args.workers,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Production server: gunicorn supervising uvicorn workers.
+
+    alembic upgrade head
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master and forked into the workers, so a
+respawned worker starts without re-importing anything. Workers never create
+tables; run the migrations first. Send HUP for a graceful worker restart.
+"""
+
+import glob
+import os
+import tempfile
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8100")
+# One event loop per core; each worker has its own DB_POOL_SIZE connections.
+workers = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Recycle workers now and then, staggered so they don't restart together.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+# Proxies trusted to report the client address in X-Forwarded-For; the rate
+# limits key on it, so behind a load balancer list its addresses or networks
+# here, or "*" when nothing else can reach the workers.
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1,::1")
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+
+if workers > 1:
+    from app.core.settings import config as app_config
+
+    # A logout evicts the cached principal only in the worker that served it.
+    if app_config.USER_CACHE_BACKEND != "redis":
+        raise RuntimeError(
+            "USER_CACHE_BACKEND=memory would let other workers accept revoked "
+            "tokens; configure REDIS_URL or run a single worker"
+        )
+
+# Workers share Prometheus samples through this directory. It must exist
+# before the app is preloaded, so it is set up here rather than in a hook;
+# a HUP re-reads this file but finds the variable set and keeps the samples.
+if workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    metrics_dir = os.path.join(tempfile.gettempdir(), "event-api-metrics")
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+        os.remove(path)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+
+def post_fork(server, worker):
+    # Never share pooled connections opened in the master with a worker.
+    from app.core.database import async_engine, engine, replicas
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for replica in replicas.engines:
+        replica.sync_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,79 @@
+"""
+Tests run the real app in-process through httpx's ASGI transport against a
+throwaway SQLite database, with Redis off and query budgets enforced.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+# Configure the app before any app module reads the environment.
+SCRATCH = tempfile.mkdtemp(prefix="event-api-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{SCRATCH}/primary.db",
+    DATABASE_REPLICA_URLS="",
+    REDIS_URL="",
+    USER_CACHE_BACKEND="memory",
+    EVENT_CACHE_BACKEND="memory",
+    RATE_LIMIT_ENABLED="false",
+    QUERY_BUDGET_MODE="raise",
+    BCRYPT_ROUNDS="4",
+    CELERY_TASK_ALWAYS_EAGER="true",
+    READ_YOUR_WRITES_SECONDS="0",
+)
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import fakeredis.aioredis  # noqa: E402
+import httpx  # noqa: E402
+
+from app.core import redis as app_redis  # noqa: E402
+from app.core.database import Base, async_engine, engine  # noqa: E402
+from app.core.event_cache import event_cache  # noqa: E402
+from app.core.rate_limit import rate_limiter  # noqa: E402
+from app.core.replicas import recent_writers  # noqa: E402
+from app.core.settings import config  # noqa: E402
+from app.core.user_cache import user_cache  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """A fresh schema and empty caches for every test."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    for cache in (user_cache.local, event_cache.local, rate_limiter.local):
+        cache.clear()
+    recent_writers.clear()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    # Pooled aiosqlite connections belong to this test's event loop.
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def redis_server():
+    """A fakeredis server standing in for REDIS_URL."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+async def redis(redis_server, monkeypatch):
+    """The app's Redis client, connected to redis_server."""
+    client = fakeredis.aioredis.FakeRedis(server=redis_server)
+    monkeypatch.setattr(config, "REDIS_URL", "redis://fakeredis")
+    monkeypatch.setattr(app_redis, "_client", client)
+    yield client
+    await client.aclose()
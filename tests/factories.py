@@ -0,0 +1,92 @@
+"""Rows inserted straight into the test database, and tokens for them."""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, update
+
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.models.attendee import Attendee
+from app.models.event import Event
+from app.models.user import User
+
+
+def create_user(index: int) -> int:
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as session:
+        user_id = session.scalar(
+            insert(User)
+            .values(
+                username=f"user{index}",
+                email=f"user{index}@example.com",
+                first_name="Test",
+                last_name=f"User {index}",
+                phone_number="0000000000",
+                password="not-a-bcrypt-hash",
+                token_version=0,
+                created_at=now,
+                updated_at=now,
+            )
+            .returning(User.id)
+        )
+        session.commit()
+    return user_id
+
+
+def create_event(max_attendees: int = 10, starts_in=timedelta(days=1), **values) -> int:
+    now = datetime.now(timezone.utc)
+    start = datetime.now() + starts_in
+    values = {
+        "name": "Test event",
+        "description": "An event for tests",
+        "start_time": start,
+        "end_time": start + timedelta(hours=2),
+        "location": "Main hall",
+        "max_attendees": max_attendees,
+        "created_at": now,
+        "updated_at": now,
+        **values,
+    }
+    with SessionLocal() as session:
+        event_id = session.scalar(insert(Event).values(**values).returning(Event.id))
+        session.commit()
+    return event_id
+
+
+def create_attendee(event_id: int, user_id: int, checked_in: bool = False) -> None:
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as session:
+        session.execute(
+            insert(Attendee).values(
+                event_id=event_id,
+                user_id=user_id,
+                check_in_status=checked_in,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        session.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(registered_count=Event.registered_count + 1)
+        )
+        session.commit()
+
+
+def attendee_user_ids(event_id: int) -> list:
+    with SessionLocal() as session:
+        return session.scalars(
+            select(Attendee.user_id).where(Attendee.event_id == event_id)
+        ).all()
+
+
+def registered_count(event_id: int) -> int:
+    with SessionLocal() as session:
+        return session.get(Event, event_id).registered_count
+
+
+def auth(index: int, token_version: int = 0) -> dict:
+    token = create_access_token(
+        data={"sub": f"user{index}@example.com", "version": token_version}
+    )
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,267 @@
+import asyncio
+import io
+from datetime import timedelta
+
+import pytest
+from openpyxl import Workbook
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.settings import config
+from app.models.attendee import Attendee
+from tests.factories import (
+    attendee_user_ids,
+    auth,
+    create_attendee,
+    create_event,
+    create_user,
+    registered_count,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def register(client, event_id: int, user: int):
+    return await client.post(f"/api/attendees/{event_id}/register", headers=auth(user))
+
+
+async def test_registration_stops_at_capacity(client):
+    for index in range(3):
+        create_user(index)
+    event_id = create_event(max_attendees=2)
+
+    responses = [await register(client, event_id, index) for index in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 400]
+    assert responses[2].json()["detail"] == "Max attendees reached"
+    assert registered_count(event_id) == 2
+    assert len(attendee_user_ids(event_id)) == 2
+
+
+async def test_concurrent_registrations_never_oversell(client):
+    for index in range(6):
+        create_user(index)
+    event_id = create_event(max_attendees=3)
+
+    responses = await asyncio.gather(
+        *(register(client, event_id, index) for index in range(6))
+    )
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 200, 200, 400, 400, 400]
+    assert registered_count(event_id) == 3
+    assert len(attendee_user_ids(event_id)) == 3
+
+
+async def test_concurrent_duplicate_registration_keeps_one_row(client):
+    user_id = create_user(0)
+    event_id = create_event(max_attendees=10)
+
+    responses = await asyncio.gather(*(register(client, event_id, 0) for _ in range(4)))
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 400, 400, 400]
+    assert {
+        response.json()["detail"]
+        for response in responses
+        if response.status_code == 400
+    } == {"Attendee already registered"}
+    # The losing requests gave their reserved seats back.
+    assert registered_count(event_id) == 1
+    assert attendee_user_ids(event_id) == [user_id]
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    """user0 may register other users."""
+    monkeypatch.setattr(config, "ADMIN_EMAILS", {"user0@example.com"})
+
+
+async def register_batch(client, event_id: int, user: int = 0, **body):
+    return await client.post(
+        f"/api/attendees/{event_id}/register_batch", json=body, headers=auth(user)
+    )
+
+
+def outcomes(response) -> list:
+    data = response.json()["data"]
+    # (user id or email as listed, message), successes first.
+    return [
+        (entry.get("user_id", entry.get("email")), entry["message"])
+        for entry in data["success"] + data["failed"]
+    ]
+
+
+async def test_batch_registration_reports_each_user(client, admin):
+    ids = [create_user(index) for index in range(4)]
+    event_id = create_event(max_attendees=10)
+    assert (await register(client, event_id, 3)).status_code == 200
+
+    response = await register_batch(
+        client,
+        event_id,
+        user_ids=[ids[0], ids[0], ids[3], 999],
+        emails=["user1@example.com", "user0@example.com", "nobody@example.com"],
+    )
+
+    assert response.status_code == 200
+    assert outcomes(response) == [
+        (ids[0], "Registered successfully"),
+        ("user1@example.com", "Registered successfully"),
+        (ids[0], "Listed more than once"),
+        (ids[3], "Attendee already registered"),
+        (999, "User not found"),
+        ("user0@example.com", "Listed more than once"),
+        ("nobody@example.com", "User not found"),
+    ]
+    assert registered_count(event_id) == 3
+    assert sorted(attendee_user_ids(event_id)) == [ids[0], ids[1], ids[3]]
+
+
+async def test_batch_over_capacity_fills_the_free_seats(client, admin):
+    ids = [create_user(index) for index in range(4)]
+    event_id = create_event(max_attendees=2)
+
+    response = await register_batch(client, event_id, user_ids=ids[1:])
+
+    assert response.status_code == 200
+    assert outcomes(response) == [
+        (ids[1], "Registered successfully"),
+        (ids[2], "Registered successfully"),
+        (ids[3], "Max attendees reached"),
+    ]
+    assert registered_count(event_id) == 2
+
+
+async def test_all_or_nothing_batch_over_capacity_registers_nobody(client, admin):
+    ids = [create_user(index) for index in range(4)]
+    event_id = create_event(max_attendees=2)
+
+    response = await register_batch(
+        client, event_id, user_ids=ids[1:], all_or_nothing=True
+    )
+
+    assert response.status_code == 409
+    assert response.json()["data"]["success"] == []
+    assert outcomes(response) == [
+        (ids[3], "Max attendees reached"),
+        (ids[1], "Not registered, the batch was rolled back"),
+        (ids[2], "Not registered, the batch was rolled back"),
+    ]
+    assert registered_count(event_id) == 0
+    assert attendee_user_ids(event_id) == []
+
+
+async def test_only_admins_register_other_users(client):
+    ids = [create_user(index) for index in range(3)]
+    event_id = create_event()
+
+    others = await register_batch(client, event_id, user_ids=[ids[1], ids[2]])
+    unknown = await register_batch(client, event_id, emails=["nobody@example.com"])
+    themselves = await register_batch(
+        client, event_id, user_ids=[ids[0]], emails=["user0@example.com"]
+    )
+
+    assert others.status_code == unknown.status_code == 403
+    assert others.json()["detail"] == "Only admins can register other users"
+    assert themselves.status_code == 200
+    assert outcomes(themselves) == [
+        (ids[0], "Registered successfully"),
+        ("user0@example.com", "Listed more than once"),
+    ]
+    assert attendee_user_ids(event_id) == [ids[0]]
+
+
+def check_in_rows(event_id: int) -> dict:
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(
+                Attendee.user_id, Attendee.check_in_status, Attendee.updated_at
+            ).where(Attendee.event_id == event_id)
+        ).all()
+    return {
+        user_id: (checked_in, updated_at) for user_id, checked_in, updated_at in rows
+    }
+
+
+async def check_in_bulk(client, event_id: int, filename: str, content: bytes):
+    return await client.post(
+        f"/api/attendees/{event_id}/checkin_bulk",
+        files={"file": (filename, content, "text/csv")},
+        headers=auth(0),
+    )
+
+
+async def test_bulk_check_in_reports_each_email(client, monkeypatch):
+    # Batches of two, so duplicates and updates span several batches.
+    monkeypatch.setattr(config, "BULK_CHECKIN_CHUNK_SIZE", 2)
+    ids = [create_user(index) for index in range(4)]
+    event_id, other_event = create_event(), create_event()
+    create_attendee(event_id, ids[0])
+    create_attendee(event_id, ids[1])
+    create_attendee(event_id, ids[2], checked_in=True)
+    create_attendee(other_event, ids[3])
+    before = check_in_rows(event_id)
+
+    response = await check_in_bulk(
+        client,
+        event_id,
+        "attendees.csv",
+        b"email\nuser0@example.com\nuser2@example.com\nuser3@example.com\n"
+        b"user1@example.com\nuser0@example.com\nnobody@example.com\n",
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [entry["email"] for entry in data["success"]] == [
+        "user0@example.com",
+        "user1@example.com",
+    ]
+    assert [(entry["email"], entry["message"]) for entry in data["failed"]] == [
+        ("user2@example.com", "Attendee already checked in."),
+        ("user3@example.com", "No attendee found for this email."),
+        ("user0@example.com", "Attendee already checked in."),
+        ("nobody@example.com", "No attendee found for this email."),
+    ]
+    after = check_in_rows(event_id)
+    assert {user_id: row[0] for user_id, row in after.items()} == {
+        ids[0]: True,
+        ids[1]: True,
+        ids[2]: True,
+    }
+    # Already checked in: reported, but the row is not written again.
+    assert after[ids[2]] == before[ids[2]]
+    assert check_in_rows(other_event)[ids[3]][0] is False
+
+
+async def test_bulk_check_in_reads_excel(client):
+    user_id = create_user(0)
+    event_id = create_event()
+    create_attendee(event_id, user_id)
+    workbook = Workbook()
+    workbook.active.append(["Name", "Email"])
+    workbook.active.append(["User", "user0@example.com"])
+    content = io.BytesIO()
+    workbook.save(content)
+
+    response = await check_in_bulk(
+        client, event_id, "attendees.xlsx", content.getvalue()
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]["success"]) == 1
+    assert check_in_rows(event_id)[user_id][0] is True
+
+
+async def test_bulk_check_in_refuses_bad_uploads_and_closed_events(client):
+    create_user(0)
+    event_id = create_event()
+    completed = create_event(starts_in=timedelta(days=-1))
+
+    wrong_type = await check_in_bulk(client, event_id, "attendees.txt", b"email\n")
+    no_column = await check_in_bulk(client, event_id, "attendees.csv", b"name\nA\n")
+    closed = await check_in_bulk(client, completed, "attendees.csv", b"email\n")
+
+    assert wrong_type.status_code == no_column.status_code == 400
+    assert closed.status_code == 400
+    assert closed.json()["detail"] == "Event is completed"
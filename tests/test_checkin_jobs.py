@@ -0,0 +1,109 @@
+import fakeredis.aioredis
+import pytest
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.settings import config
+from app.models.attendee import Attendee
+from app.tasks import tasks
+from tests.factories import auth, create_attendee, create_event, create_user
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def celery_redis(redis_server, monkeypatch):
+    """Point the (eager) Celery task at the same fakeredis as the API."""
+    monkeypatch.setattr(
+        tasks,
+        "get_job_redis",
+        lambda: fakeredis.aioredis.FakeRedis(server=redis_server),
+    )
+
+
+def upload(*emails: str) -> dict:
+    content = "email\n" + "\n".join(emails) + "\n"
+    return {"file": ("attendees.csv", content.encode(), "text/csv")}
+
+
+async def test_async_bulk_check_in_runs_the_job_end_to_end(
+    client, redis, celery_redis, monkeypatch
+):
+    monkeypatch.setattr(config, "BULK_CHECKIN_CHUNK_SIZE", 2)
+    event_id = create_event()
+    for index in range(3):
+        create_attendee(event_id, create_user(index))
+
+    response = await client.post(
+        f"/api/attendees/{event_id}/checkin_bulk",
+        params={"mode": "async"},
+        files=upload(
+            "user0@example.com",
+            "user1@example.com",
+            "nobody@example.com",
+            "user2@example.com",
+            "user0@example.com",
+        ),
+        headers=auth(0),
+    )
+    assert response.status_code == 202
+    job_id = response.json()["data"]["job_id"]
+
+    # Eager mode ran the task before the upload request returned.
+    response = await client.get(
+        f"/api/attendees/jobs/{job_id}", params={"limit": 3}, headers=auth(0)
+    )
+    job = response.json()["data"]
+    assert job["status"] == "completed"
+    assert (job["processed"], job["succeeded"], job["failed"]) == (5, 3, 2)
+
+    response = await client.get(
+        f"/api/attendees/jobs/{job_id}",
+        params={"limit": 3, "cursor": response.json()["next_cursor"]},
+        headers=auth(0),
+    )
+    assert response.json()["next_cursor"] is None
+    results = job["results"] + response.json()["data"]["results"]
+    # Each chunk of two lists its check-ins before its failures.
+    assert [(result["email"], result["message"]) for result in results] == [
+        ("user0@example.com", "Check-in successful."),
+        ("user1@example.com", "Check-in successful."),
+        ("user2@example.com", "Check-in successful."),
+        ("nobody@example.com", "No attendee found for this email."),
+        ("user0@example.com", "Attendee already checked in."),
+    ]
+
+    with SessionLocal() as session:
+        statuses = session.scalars(select(Attendee.check_in_status)).all()
+    assert statuses == [True, True, True]
+
+
+async def test_jobs_are_only_visible_to_their_owner(client, redis, celery_redis):
+    event_id = create_event()
+    create_user(0)
+    create_user(1)
+
+    response = await client.post(
+        f"/api/attendees/{event_id}/checkin_bulk",
+        params={"mode": "async"},
+        files=upload("user0@example.com"),
+        headers=auth(0),
+    )
+    job_id = response.json()["data"]["job_id"]
+
+    response = await client.get(f"/api/attendees/jobs/{job_id}", headers=auth(1))
+    assert response.status_code == 404
+
+
+async def test_async_mode_needs_redis(client):
+    event_id = create_event()
+    create_user(0)
+
+    response = await client.post(
+        f"/api/attendees/{event_id}/checkin_bulk",
+        params={"mode": "async"},
+        files=upload("user0@example.com"),
+        headers=auth(0),
+    )
+
+    assert response.status_code == 503
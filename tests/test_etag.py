@@ -0,0 +1,74 @@
+import pytest
+
+from app.utils.etag import etag_matches
+from tests.factories import auth, create_attendee, create_event, create_user
+
+pytestmark = pytest.mark.anyio
+
+
+async def get(client, url: str, etag: str = None, **params):
+    headers = auth(0)
+    if etag:
+        headers["If-None-Match"] = etag
+    return await client.get(url, params=params, headers=headers)
+
+
+async def test_event_detail_answers_304_until_the_event_changes(client):
+    create_user(0)
+    event_id = create_event()
+    url = f"/api/events/{event_id}"
+
+    first = await get(client, url)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    cached = await get(client, url, etag)
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    await client.put(url, json={"name": "Renamed"}, headers=auth(0))
+    changed = await get(client, url, etag)
+    assert changed.status_code == 200
+    assert changed.json()["data"]["name"] == "Renamed"
+    assert changed.headers["ETag"] != etag
+
+
+async def test_event_listing_answers_304_until_the_set_changes(client):
+    create_user(0)
+    create_event()
+
+    etag = (await get(client, "/api/events/")).headers["ETag"]
+    assert (await get(client, "/api/events/", etag)).status_code == 304
+    # Another filter or page is another representation.
+    assert (await get(client, "/api/events/", etag, limit=1)).status_code == 200
+
+    create_event()
+    changed = await get(client, "/api/events/", etag)
+    assert changed.status_code == 200
+    assert len(changed.json()["data"]) == 2
+
+
+async def test_attendee_listing_changes_with_check_ins(client):
+    user_id = create_user(0)
+    event_id = create_event()
+    create_attendee(event_id, user_id)
+    url = f"/api/attendees/{event_id}/list"
+
+    etag = (await get(client, url)).headers["ETag"]
+    assert (await get(client, url, etag)).status_code == 304
+
+    await client.post(f"/api/attendees/{event_id}/checkin", headers=auth(0))
+    changed = await get(client, url, etag)
+    assert changed.status_code == 200
+    assert changed.json()["data"][0]["check_in_status"] is True
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    etag = 'W/"abc"'
+
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"other", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"other"', etag)
+    assert not etag_matches(None, etag)
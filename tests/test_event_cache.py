@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.event_cache import EventCache, EventSnapshot
+
+pytestmark = pytest.mark.anyio
+
+
+def snapshot(event_id: int) -> EventSnapshot:
+    now = datetime.now()
+    return EventSnapshot(
+        id=event_id,
+        name="Test event",
+        description=None,
+        start_time=now,
+        end_time=now,
+        location="Main hall",
+        max_attendees=10,
+        status=None,
+        updated_at=now,
+    )
+
+
+async def test_fill_after_an_invalidation_is_dropped():
+    cache = EventCache("memory", ttl=60, local_ttl=60, maxsize=10)
+
+    _, token = await cache.get(1)
+    await cache.invalidate(1)
+    await cache.set(1, snapshot(1), token)
+    assert (await cache.get(1))[0] is None
+
+    event = snapshot(1)
+    _, token = await cache.get(1)
+    await cache.set(1, event, token)
+    assert (await cache.get(1))[0] == event
+
+
+async def test_invalidation_bookkeeping_stays_bounded():
+    cache = EventCache("memory", ttl=60, local_ttl=60, maxsize=10)
+    _, token = await cache.get(1)
+
+    for event_id in range(1, 1001):
+        await cache.invalidate(event_id)
+
+    assert len(cache._invalidated) == 10
+    # Event 1's invalidation was evicted, but the fill is still refused.
+    await cache.set(1, snapshot(1), token)
+    assert (await cache.get(1))[0] is None
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from tests.factories import auth, create_event, create_user
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_listings_derive_status_at_query_time(client):
+    create_user(0)
+    # Starts after the app was imported, so an import-time clock says "scheduled".
+    event_id = create_event(starts_in=timedelta(0), name="Opening keynote")
+
+    listed = await client.get("/api/events/", headers=auth(0))
+    searched = await client.get(
+        "/api/events/search", params={"q": "keynote"}, headers=auth(0)
+    )
+    detail = await client.get(f"/api/events/{event_id}", headers=auth(0))
+    filtered = await client.get(
+        "/api/events/", params={"status": "ongoing"}, headers=auth(0)
+    )
+
+    assert detail.json()["data"]["status"] == "ongoing"
+    for response in (listed, searched, filtered):
+        assert [event["status"] for event in response.json()["data"]] == ["ongoing"]
+
+
+async def search(client, q: str, **params) -> dict:
+    response = await client.get(
+        "/api/events/search", params={"q": q, **params}, headers=auth(0)
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_search_ranks_name_over_location_over_description(client):
+    create_user(0)
+    create_event(name="Quiet evening", description="Jazz quartet live")
+    create_event(name="Brunch", location="Jazz cellar")
+    create_event(name="Jazz night")
+    create_event(name="Rock night")
+
+    found = await search(client, "jazz")
+
+    assert [event["name"] for event in found["data"]] == [
+        "Jazz night",
+        "Brunch",
+        "Quiet evening",
+    ]
+
+
+async def test_search_pages_with_a_cursor(client):
+    create_user(0)
+    for index in range(5):
+        create_event(name=f"Workshop {index}")
+
+    names = []
+    page = await search(client, "workshop", limit=2)
+    while True:
+        names += [event["name"] for event in page["data"]]
+        if page["next_cursor"] is None:
+            break
+        page = await search(client, "workshop", limit=2, cursor=page["next_cursor"])
+
+    assert names == [f"Workshop {index}" for index in range(5)]
+
+
+async def test_search_treats_like_wildcards_literally(client):
+    create_user(0)
+    create_event(name="100% organic market")
+    create_event(name="1000 stalls")
+    create_event(name="snake_case meetup")
+    create_event(name="snakes and ladders")
+
+    percent = await search(client, "100%")
+    underscore = await search(client, "snake_")
+
+    assert [event["name"] for event in percent["data"]] == ["100% organic market"]
+    assert [event["name"] for event in underscore["data"]] == ["snake_case meetup"]
+
+
+async def test_ongoing_event_moved_to_the_future_is_scheduled_again(client):
+    create_user(0)
+    # Already marked ongoing by the scheduler.
+    event_id = create_event(starts_in=timedelta(minutes=-5), status="ongoing")
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%d/%m/%Y")
+
+    response = await client.put(
+        f"/api/events/{event_id}",
+        json={"date": tomorrow, "start_time": "10:00 AM", "end_time": "11:00 AM"},
+        headers=auth(0),
+    )
+    assert response.status_code == 200
+
+    detail = await client.get(f"/api/events/{event_id}", headers=auth(0))
+    filtered = await client.get(
+        "/api/events/", params={"status": "scheduled"}, headers=auth(0)
+    )
+    assert response.json()["data"]["status"] == "scheduled"
+    assert detail.json()["data"]["status"] == "scheduled"
+    assert [event["event_id"] for event in filtered.json()["data"]] == [event_id]
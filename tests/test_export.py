@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from app.core.settings import config
+from tests.factories import auth, create_attendee, create_event, create_user
+
+pytestmark = pytest.mark.anyio
+
+COLUMNS = [
+    "attendee_id",
+    "user_id",
+    "email",
+    "first_name",
+    "last_name",
+    "check_in_status",
+    "registered_at",
+]
+
+
+@pytest.fixture
+def event_id(monkeypatch):
+    """Five attendees, the first two checked in, read back in batches of two."""
+    monkeypatch.setattr(config, "EXPORT_BATCH_SIZE", 2)
+    create_user(0)
+    event_id = create_event()
+    for index in range(5):
+        create_attendee(event_id, create_user(index + 1), checked_in=index < 2)
+    return event_id
+
+
+async def export(client, event_id: int, **params):
+    return await client.get(
+        f"/api/attendees/{event_id}/export", params=params, headers=auth(0)
+    )
+
+
+async def test_csv_export_streams_every_attendee(client, event_id):
+    response = await export(client, event_id)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == (
+        f'attachment; filename="event_{event_id}_attendees.csv"'
+    )
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == COLUMNS
+    assert [row[2] for row in rows[1:]] == [
+        f"user{index}@example.com" for index in range(1, 6)
+    ]
+
+
+async def test_ndjson_export_filters_by_check_in_status(client, event_id):
+    response = await export(client, event_id, format="ndjson", check_in_status=True)
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["email"] for record in records] == [
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert set(records[0]) == set(COLUMNS)
+
+
+async def test_xlsx_export_is_a_workbook(client, event_id):
+    response = await export(client, event_id, format="xlsx")
+
+    workbook = load_workbook(io.BytesIO(response.content), read_only=True)
+    rows = list(workbook.active.iter_rows(values_only=True))
+    assert list(rows[0]) == COLUMNS
+    assert len(rows) == 6
+    assert [row[5] for row in rows[1:]] == [True, True, False, False, False]
+
+
+async def test_export_of_a_missing_event_is_404(client):
+    create_user(0)
+
+    response = await export(client, 999)
+
+    assert response.status_code == 404
@@ -0,0 +1,44 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.utils.file_readers import iter_email_batches
+
+pytestmark = pytest.mark.anyio
+
+
+async def read_emails(filename: str, content: bytes, batch_size: int = 100) -> list:
+    upload = UploadFile(io.BytesIO(content), filename=filename)
+    batches = [batch async for batch in iter_email_batches(upload, batch_size, 10**6)]
+    assert all(len(batch) <= batch_size for batch in batches)
+    assert not upload.file.closed
+    return [email for batch in batches for email in batch]
+
+
+async def test_multi_line_fields_survive_chunk_boundaries():
+    rows = 3000
+    lines = ["email,notes"] + [
+        f'user{index}@example.com,"line one\nline two\nline three"'
+        for index in range(rows)
+    ]
+    content = "\n".join(lines).encode()
+    # Large enough that quoted fields straddle the chunks the file is read in.
+    assert len(content) > 2 * 64 * 1024
+
+    emails = await read_emails("attendees.csv", content)
+
+    assert emails == [f"user{index}@example.com" for index in range(rows)]
+
+
+async def test_csv_header_and_encoding():
+    content = "\ufeffName,EMAIL\r\nAda, ada@example.com \r\n\r\nBob,\r\n".encode()
+
+    assert await read_emails("attendees.csv", content) == ["ada@example.com"]
+
+
+async def test_csv_without_an_email_column_is_refused():
+    with pytest.raises(HTTPException) as error:
+        await read_emails("attendees.csv", b"name\nAda\n")
+
+    assert error.value.status_code == 400
@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import json
+
+import pytest
+from sqlalchemy import update
+
+from app.core.database import SessionLocal
+from app.core.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER
+from app.core.settings import config
+from app.models.event import Event
+from tests.factories import (
+    attendee_user_ids,
+    auth,
+    create_event,
+    create_user,
+    registered_count,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def register(client, event_id: int, key: str, user: int = 0):
+    headers = {**auth(user), IDEMPOTENCY_HEADER: key}
+    return await client.post(f"/api/attendees/{event_id}/register", headers=headers)
+
+
+async def test_retry_replays_the_first_response(client, redis):
+    user_id = create_user(0)
+    event_id = create_event()
+
+    first = await register(client, event_id, "retry-1")
+    retry = await register(client, event_id, "retry-1")
+
+    assert first.status_code == retry.status_code == 200
+    assert REPLAYED_HEADER not in first.headers
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert attendee_user_ids(event_id) == [user_id]
+
+
+async def test_client_errors_are_replayed_too(client, redis):
+    create_user(0)
+    event_id = create_event(max_attendees=0)
+
+    first = await register(client, event_id, "full-1")
+    with SessionLocal() as session:
+        session.execute(update(Event).values(max_attendees=10))
+        session.commit()
+    retry = await register(client, event_id, "full-1")
+
+    assert first.status_code == retry.status_code == 400
+    assert retry.json() == {"detail": "Max attendees reached"}
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    # The retry did not run again now that a seat is free.
+    assert registered_count(event_id) == 0
+
+
+async def test_concurrent_duplicate_waits_for_the_first_response(client, redis):
+    user_id = create_user(0)
+    event_id = create_event()
+
+    responses = await asyncio.gather(
+        register(client, event_id, "double-click"),
+        register(client, event_id, "double-click"),
+    )
+
+    assert [response.status_code for response in responses] == [200, 200]
+    replayed = [REPLAYED_HEADER in response.headers for response in responses]
+    assert sorted(replayed) == [False, True]
+    assert attendee_user_ids(event_id) == [user_id]
+
+
+async def test_still_running_request_answers_409_after_the_wait(
+    client, redis, monkeypatch
+):
+    monkeypatch.setattr(config, "IDEMPOTENCY_WAIT_SECONDS", 0.1)
+    create_user(0)
+    event_id = create_event()
+    # The same request, claimed by a worker that has not finished it.
+    path = f"/api/attendees/{event_id}/register"
+    fingerprint = hashlib.sha256(f"POST {path}?\n".encode()).hexdigest()
+    await redis.set(
+        "idempotency:user0@example.com:slow",
+        json.dumps({"state": "pending", "fingerprint": fingerprint}),
+    )
+
+    response = await register(client, event_id, "slow")
+
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert attendee_user_ids(event_id) == []
+
+
+async def test_reusing_a_key_for_another_request_is_refused(client, redis):
+    create_user(0)
+    first_event, second_event = create_event(), create_event()
+
+    assert (await register(client, first_event, "reused")).status_code == 200
+    response = await register(client, second_event, "reused")
+
+    assert response.status_code == 422
+    assert attendee_user_ids(second_event) == []
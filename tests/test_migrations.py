@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from sqlalchemy import text
+
+from alembic import command
+from alembic.config import Config
+from app.core.database import Base, engine
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def alembic_config() -> Config:
+    # No ini file: env.py leaves logging alone and migrates DATABASE_URL.
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    return config
+
+
+def test_upgrade_from_the_original_schema_backfills_and_dedupes():
+    config = alembic_config()
+    Base.metadata.drop_all(engine)
+    command.upgrade(config, "0001")
+
+    with engine.begin() as connection:
+        now = "2026-01-01 00:00:00"
+        for index in range(3):
+            connection.execute(
+                text(
+                    "INSERT INTO users (username, email, first_name, last_name, "
+                    "password, token_version, created_at, updated_at) VALUES "
+                    "(:name, :email, 'Test', 'User', 'x', 0, :now, :now)"
+                ),
+                {
+                    "name": f"user{index}",
+                    "email": f"user{index}@example.com",
+                    "now": now,
+                },
+            )
+        for index in range(2):
+            connection.execute(
+                text(
+                    "INSERT INTO events (name, start_time, end_time, location, "
+                    "max_attendees, status, created_at, updated_at) VALUES "
+                    "(:name, :now, :now, 'Hall', 10, 'scheduled', :now, :now)"
+                ),
+                {"name": f"event{index}", "now": now},
+            )
+        # (user_id, event_id, check_in_status): user 1 registered twice for
+        # both events, checked in only through the duplicate for event 1.
+        for user_id, event_id, checked_in in [
+            (1, 1, False),
+            (1, 1, True),
+            (2, 1, False),
+            (3, 1, False),
+            (1, 2, False),
+            (1, 2, False),
+        ]:
+            connection.execute(
+                text(
+                    "INSERT INTO attendees (user_id, event_id, check_in_status, "
+                    "created_at, updated_at) VALUES (:user_id, :event_id, "
+                    ":checked_in, :now, :now)"
+                ),
+                {
+                    "user_id": user_id,
+                    "event_id": event_id,
+                    "checked_in": checked_in,
+                    "now": now,
+                },
+            )
+
+    command.upgrade(config, "head")
+    # The migrated schema matches the models.
+    command.check(config)
+
+    with engine.connect() as connection:
+        attendees = connection.execute(
+            text(
+                "SELECT id, user_id, event_id, check_in_status FROM attendees "
+                "ORDER BY id"
+            )
+        ).all()
+        counts = connection.execute(
+            text("SELECT id, registered_count FROM events ORDER BY id")
+        ).all()
+    assert attendees == [
+        (1, 1, 1, True),
+        (3, 2, 1, False),
+        (4, 3, 1, False),
+        (5, 1, 2, False),
+    ]
+    assert counts == [(1, 3), (2, 1)]
+
+    command.downgrade(config, "base")
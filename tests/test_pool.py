@@ -0,0 +1,24 @@
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.pool import pool_stats
+from tests.conftest import SCRATCH
+
+
+def test_pool_stats_count_overflow_only_past_the_pool_size():
+    engine = create_engine(
+        f"sqlite:///{SCRATCH}/pool.db",
+        poolclass=QueuePool,
+        pool_size=2,
+        max_overflow=3,
+    )
+    try:
+        assert pool_stats(engine.pool)["overflow"] == 0
+
+        connections = [engine.connect() for _ in range(3)]
+        stats = pool_stats(engine.pool)
+        assert (stats["checked_out"], stats["overflow"]) == (3, 1)
+        for connection in connections:
+            connection.close()
+    finally:
+        engine.dispose()
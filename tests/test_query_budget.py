@@ -0,0 +1,89 @@
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_engine, get_db
+from app.core.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    capture_queries,
+    query_budget,
+)
+from app.models.user import User
+from tests.factories import auth, create_event, create_user
+
+pytestmark = pytest.mark.anyio
+
+
+def budget_app(budget: int, statements: int) -> FastAPI:
+    """An app whose one route runs `statements` queries under `budget`."""
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware, mode="raise")
+
+    @app.get("/run")
+    @query_budget(budget)
+    async def run(db: AsyncSession = Depends(get_db)):
+        for _ in range(statements):
+            await db.execute(text("SELECT 1"))
+        return {}
+
+    return app
+
+
+async def call(app: FastAPI) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/run")
+    await async_engine.dispose()
+    return response
+
+
+async def test_route_within_budget_passes():
+    response = await call(budget_app(budget=2, statements=2))
+    assert response.status_code == 200
+
+
+async def test_route_over_budget_fails():
+    with pytest.raises(QueryBudgetExceeded, match="ran 3 SQL statements, budget is 2"):
+        await call(budget_app(budget=2, statements=3))
+
+
+async def test_repeated_select_is_reported_as_n_plus_one():
+    user_ids = [create_user(i) for i in range(5)]
+    with capture_queries() as log:
+        async with async_engine.connect() as connection:
+            for user_id in user_ids:
+                await connection.execute(select(User.email).where(User.id == user_id))
+    await async_engine.dispose()
+
+    assert len(log) == 5
+    [(shape, count)] = log.suspected_n_plus_one()
+    assert count == 5 and shape.startswith("SELECT users.email")
+    assert "likely N+1" in log.report()
+
+
+async def test_hot_paths_stay_within_their_budgets(client):
+    # QUERY_BUDGET_MODE is "raise" for the whole suite, so any overrun fails here.
+    for index in range(3):
+        create_user(index)
+    event_ids = [create_event(max_attendees=5) for _ in range(3)]
+
+    for event_id in event_ids:
+        for index in range(3):
+            response = await client.post(
+                f"/api/attendees/{event_id}/register", headers=auth(index)
+            )
+            assert response.status_code == 200
+        response = await client.post(
+            f"/api/attendees/{event_id}/checkin", headers=auth(0)
+        )
+        assert response.status_code == 200
+        response = await client.get(f"/api/attendees/{event_id}/list", headers=auth(0))
+        assert len(response.json()["data"]) == 3
+        response = await client.get(f"/api/events/{event_id}", headers=auth(0))
+        assert response.status_code == 200
+
+    response = await client.get("/api/events/", headers=auth(0))
+    assert len(response.json()["data"]) == 3
@@ -0,0 +1,40 @@
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.core.rate_limit import limit_by_ip
+from app.core.settings import config
+
+pytestmark = pytest.mark.anyio
+
+PROXY = "10.0.0.2"
+
+
+@pytest.fixture
+async def proxied_client(monkeypatch):
+    """One request a minute per client IP, served behind a trusted proxy."""
+    monkeypatch.setattr(config, "RATE_LIMIT_ENABLED", True)
+    app = FastAPI()
+
+    @app.post("/signup", dependencies=[Depends(limit_by_ip("test", "1/minute"))])
+    async def signup():
+        return {}
+
+    # What the uvicorn workers do with gunicorn's forwarded_allow_ips.
+    transport = httpx.ASGITransport(
+        app=ProxyHeadersMiddleware(app, trusted_hosts=PROXY), client=(PROXY, 4321)
+    )
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def post_from(client, ip: str) -> int:
+    response = await client.post("/signup", headers={"X-Forwarded-For": ip})
+    return response.status_code
+
+
+async def test_clients_behind_a_trusted_proxy_get_their_own_buckets(proxied_client):
+    assert await post_from(proxied_client, "203.0.113.1") == 200
+    assert await post_from(proxied_client, "203.0.113.1") == 429
+    assert await post_from(proxied_client, "203.0.113.2") == 200
@@ -0,0 +1,97 @@
+"""Read routing, with a second SQLite database standing in for a replica."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import AsyncSessionLocal
+from app.core.replicas import ReplicaSet, recent_writer_key, recent_writers
+from app.core.settings import config
+from tests.conftest import SCRATCH
+from tests.factories import auth, create_event, create_user
+
+pytestmark = pytest.mark.anyio
+
+PRIMARY = make_url(config.DATABASE_URL).database
+REPLICA = f"{SCRATCH}/replica.db"
+
+
+def replicate() -> None:
+    """Copy the primary onto the replica, as replication would eventually."""
+    with sqlite3.connect(PRIMARY) as source, sqlite3.connect(REPLICA) as target:
+        source.backup(target)
+
+
+@pytest.fixture
+async def replicas(monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{REPLICA}")
+    replica_set = ReplicaSet([engine], retry_after=30)
+    monkeypatch.setitem(AsyncSessionLocal.kw, "replicas", replica_set)
+    yield replica_set
+    await engine.dispose()
+
+
+async def list_attendees(client, event_id: int, user: int) -> list:
+    response = await client.get(f"/api/attendees/{event_id}/list", headers=auth(user))
+    assert response.status_code == 200
+    return [attendee["user_id"] for attendee in response.json()["data"]]
+
+
+async def test_reads_go_to_the_replica(client, replicas):
+    create_user(0)
+    create_event(name="Replicated")
+    replicate()
+    create_event(name="Not replicated yet")
+
+    response = await client.get("/api/events/", headers=auth(0))
+
+    assert [event["name"] for event in response.json()["data"]] == ["Replicated"]
+
+
+async def test_reads_fall_back_to_the_primary_when_the_replica_is_down(
+    client, replicas
+):
+    create_user(0)
+    replicate()
+    create_event()
+    replicas.mark_down(0)
+
+    response = await client.get("/api/events/", headers=auth(0))
+
+    assert len(response.json()["data"]) == 1
+
+
+async def test_writes_use_the_primary(client, replicas):
+    user_id = create_user(0)
+    event_id = create_event()
+    replicate()
+
+    response = await client.post(f"/api/attendees/{event_id}/register", headers=auth(0))
+
+    assert response.status_code == 200
+    # The replica has not caught up, so a plain read misses the new row.
+    assert await list_attendees(client, event_id, 0) == []
+    replicate()
+    assert await list_attendees(client, event_id, 0) == [user_id]
+
+
+async def test_read_your_writes_window_is_shared_by_workers(
+    client, replicas, redis, monkeypatch
+):
+    monkeypatch.setattr(config, "READ_YOUR_WRITES_SECONDS", 30)
+    writer_id = create_user(0)
+    create_user(1)
+    event_id = create_event()
+    replicate()
+
+    response = await client.post(f"/api/attendees/{event_id}/register", headers=auth(0))
+    assert response.status_code == 200
+    assert await redis.pttl(recent_writer_key("user0@example.com")) > 0
+    # The next request lands on another worker, which never saw the write.
+    recent_writers.clear()
+
+    assert await list_attendees(client, event_id, 0) == [writer_id]
+    # Everyone else still reads the lagging replica.
+    assert await list_attendees(client, event_id, 1) == []
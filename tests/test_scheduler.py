@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.event import Event
+from app.tasks.scheduler import next_run_delay, next_transition_at, run_due_transitions
+from app.utils.constants import EventStatus
+from tests.factories import create_event
+
+
+def stored_statuses() -> dict:
+    with SessionLocal() as session:
+        return dict(session.execute(select(Event.name, Event.status)).all())
+
+
+def test_run_due_transitions_moves_only_due_events():
+    # Every event runs for two hours from its start.
+    create_event(name="starting", starts_in=timedelta(minutes=-5))
+    create_event(name="ended", starts_in=timedelta(hours=-3))
+    create_event(
+        name="ongoing and ended",
+        starts_in=timedelta(hours=-3),
+        status=EventStatus.ongoing,
+    )
+    create_event(
+        name="canceled", starts_in=timedelta(hours=-3), status=EventStatus.canceled
+    )
+    create_event(name="later", starts_in=timedelta(days=1))
+
+    with SessionLocal() as session:
+        transitioned = run_due_transitions(session, datetime.now())
+
+    assert {status: len(ids) for status, ids in transitioned.items()} == {
+        "ongoing": 1,
+        "completed": 2,
+    }
+    assert stored_statuses() == {
+        "starting": EventStatus.ongoing,
+        "ended": EventStatus.completed,
+        "ongoing and ended": EventStatus.completed,
+        "canceled": EventStatus.canceled,
+        "later": EventStatus.scheduled,
+    }
+
+
+def test_next_transition_is_the_earliest_pending_start_or_end():
+    now = datetime.now()
+    with SessionLocal() as session:
+        assert next_transition_at(session) is None
+
+    create_event(starts_in=timedelta(days=2))
+    create_event(starts_in=timedelta(hours=-1), status=EventStatus.ongoing)
+    create_event(starts_in=timedelta(hours=-1), status=EventStatus.canceled)
+
+    with SessionLocal() as session:
+        next_at = next_transition_at(session)
+    # The ongoing event ends an hour from now.
+    assert timedelta(minutes=59) < next_at - now < timedelta(minutes=61)
+
+
+def test_next_run_delay():
+    now = datetime(2026, 1, 1, 12, 0)
+
+    assert next_run_delay(None, now, max_sleep=300) == 300
+    assert next_run_delay(now + timedelta(seconds=10), now, max_sleep=300) == 11
+    assert next_run_delay(now + timedelta(hours=1), now, max_sleep=300) == 300
+    # A transition already due runs again straight away.
+    assert next_run_delay(now - timedelta(minutes=5), now, max_sleep=300) == 1
@@ -0,0 +1,65 @@
+import pytest
+from redis.asyncio import Redis
+
+from app.core import redis as app_redis
+from app.core.settings import config
+from app.core.user_cache import UserCache, UserPrincipal, user_cache
+from tests.factories import auth, create_user
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_redis_backend_invalidation_reaches_every_worker(redis):
+    # Two workers' caches over one Redis.
+    first, second = (UserCache("redis", ttl=60, maxsize=10) for _ in range(2))
+    principal = UserPrincipal(
+        id=1, email="user0@example.com", username="user0", token_version=0
+    )
+
+    await first.set(principal)
+    assert await second.get("user0@example.com", 0) == principal
+
+    await first.invalidate("user0@example.com", 0)
+    assert await second.get("user0@example.com", 0) is None
+
+
+async def test_logout_revokes_a_cached_token(client, redis, monkeypatch):
+    monkeypatch.setattr(user_cache, "backend", "redis")
+    create_user(0)
+    headers = auth(0)
+
+    assert (await client.get("/api/events/", headers=headers)).status_code == 200
+    assert await redis.exists("user_principal:user0@example.com:0")
+
+    assert (await client.post("/api/auth/logout/", headers=headers)).status_code == 200
+    assert (await client.get("/api/events/", headers=headers)).status_code == 401
+
+
+async def test_unreachable_redis_is_skipped_until_retry(monkeypatch):
+    # Nothing listens on port 1, so the connection is refused straight away.
+    broken = Redis.from_url("redis://127.0.0.1:1/0")
+    monkeypatch.setattr(app_redis, "_client", broken)
+    monkeypatch.setattr(config, "REDIS_URL", "redis://127.0.0.1:1/0")
+    cache = UserCache("redis", ttl=60, maxsize=10, retry_after=30)
+    principal = UserPrincipal(
+        id=1, email="user0@example.com", username="user0", token_version=0
+    )
+    calls = []
+    get = broken.get
+
+    async def counting_get(*args, **kwargs):
+        calls.append(args)
+        return await get(*args, **kwargs)
+
+    monkeypatch.setattr(broken, "get", counting_get)
+
+    assert await cache.get("user0@example.com", 0) is None
+    await cache.set(principal)
+    assert await cache.get("user0@example.com", 0) is None
+    assert len(calls) == 1
+
+    # Once retry_after has passed Redis is tried again.
+    cache._redis_down_until = 0
+    assert await cache.get("user0@example.com", 0) is None
+    assert len(calls) == 2
+    await broken.aclose()